@@ -1,11 +1,19 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import Value
+from django.db.models.functions import Concat
 from .models import (
     User, Profile, Student, Supervisor, Company, Attachment,
     SupervisorAssignment, VerificationStatus, WeeklyLog, 
     Evaluation, Reimbursement, Message
 )
 
+
+def full_name_expression(prefix):
+    """Build a 'first last' Concat for the user reached through ``prefix``"""
+    return Concat(f'{prefix}first_name', Value(' '), f'{prefix}last_name')
+
+
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
     list_display = ('email', 'first_name', 'last_name', 'role', 'is_active')
@@ -28,18 +36,30 @@ class StudentAdmin(admin.ModelAdmin):
     search_fields = ('student_id', 'user__first_name', 'user__last_name', 'program')
     list_filter = ('year_of_study', 'program')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _full_name=full_name_expression('user__')
+        )
+    
     def get_full_name(self, obj):
-        return f"{obj.user.first_name} {obj.user.last_name}"
+        return obj._full_name
     get_full_name.short_description = 'Full Name'
+    get_full_name.admin_order_field = '_full_name'
 
 @admin.register(Supervisor)
 class SupervisorAdmin(admin.ModelAdmin):
     list_display = ('get_full_name', 'created_at')
     search_fields = ('user__first_name', 'user__last_name')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _full_name=full_name_expression('user__')
+        )
+    
     def get_full_name(self, obj):
-        return f"{obj.user.first_name} {obj.user.last_name}"
+        return obj._full_name
     get_full_name.short_description = 'Full Name'
+    get_full_name.admin_order_field = '_full_name'
 
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
@@ -50,12 +70,19 @@ class CompanyAdmin(admin.ModelAdmin):
 @admin.register(Attachment)
 class AttachmentAdmin(admin.ModelAdmin):
     list_display = ('get_student_name', 'company', 'start_date', 'end_date', 'created_at')
+    list_select_related = ('company',)
     search_fields = ('student__user__first_name', 'student__user__last_name', 'company__name')
     list_filter = ('start_date', 'end_date')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _student_name=full_name_expression('student__user__')
+        )
+    
     def get_student_name(self, obj):
-        return f"{obj.student.user.first_name} {obj.student.user.last_name}"
+        return obj._student_name
     get_student_name.short_description = 'Student'
+    get_student_name.admin_order_field = '_student_name'
 
 @admin.register(SupervisorAssignment)
 class SupervisorAssignmentAdmin(admin.ModelAdmin):
@@ -63,13 +90,21 @@ class SupervisorAssignmentAdmin(admin.ModelAdmin):
     search_fields = ('student__user__first_name', 'supervisor__user__first_name')
     list_filter = ('status',)
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _student_name=full_name_expression('student__user__'),
+            _supervisor_name=full_name_expression('supervisor__user__')
+        )
+    
     def get_student_name(self, obj):
-        return f"{obj.student.user.first_name} {obj.student.user.last_name}"
+        return obj._student_name
     get_student_name.short_description = 'Student'
+    get_student_name.admin_order_field = '_student_name'
     
     def get_supervisor_name(self, obj):
-        return f"{obj.supervisor.user.first_name} {obj.supervisor.user.last_name}"
+        return obj._supervisor_name
     get_supervisor_name.short_description = 'Supervisor'
+    get_supervisor_name.admin_order_field = '_supervisor_name'
 
 @admin.register(VerificationStatus)
 class VerificationStatusAdmin(admin.ModelAdmin):
@@ -77,9 +112,15 @@ class VerificationStatusAdmin(admin.ModelAdmin):
     search_fields = ('student__user__first_name', 'student__user__last_name')
     list_filter = ('is_verified', 'fee_verified')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _student_name=full_name_expression('student__user__')
+        )
+    
     def get_student_name(self, obj):
-        return f"{obj.student.user.first_name} {obj.student.user.last_name}"
+        return obj._student_name
     get_student_name.short_description = 'Student'
+    get_student_name.admin_order_field = '_student_name'
 
 @admin.register(WeeklyLog)
 class WeeklyLogAdmin(admin.ModelAdmin):
@@ -87,9 +128,15 @@ class WeeklyLogAdmin(admin.ModelAdmin):
     search_fields = ('student__user__first_name', 'student__user__last_name')
     list_filter = ('week_number', 'day', 'date')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _student_name=full_name_expression('student__user__')
+        )
+    
     def get_student_name(self, obj):
-        return f"{obj.student.user.first_name} {obj.student.user.last_name}"
+        return obj._student_name
     get_student_name.short_description = 'Student'
+    get_student_name.admin_order_field = '_student_name'
 
 @admin.register(Evaluation)
 class EvaluationAdmin(admin.ModelAdmin):
@@ -97,23 +144,38 @@ class EvaluationAdmin(admin.ModelAdmin):
     search_fields = ('student__user__first_name', 'evaluator__first_name')
     list_filter = ('evaluation_date', 'total')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _student_name=full_name_expression('student__user__'),
+            _evaluator_name=full_name_expression('evaluator__')
+        )
+    
     def get_student_name(self, obj):
-        return f"{obj.student.user.first_name} {obj.student.user.last_name}"
+        return obj._student_name
     get_student_name.short_description = 'Student'
+    get_student_name.admin_order_field = '_student_name'
     
     def get_evaluator_name(self, obj):
-        return f"{obj.evaluator.first_name} {obj.evaluator.last_name}"
+        return obj._evaluator_name
     get_evaluator_name.short_description = 'Evaluator'
+    get_evaluator_name.admin_order_field = '_evaluator_name'
 
 @admin.register(Reimbursement)
 class ReimbursementAdmin(admin.ModelAdmin):
     list_display = ('get_student_name', 'company', 'amount', 'status', 'created_at')
+    list_select_related = ('company',)
     search_fields = ('student__user__first_name', 'company__name')
     list_filter = ('status', 'created_at')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _student_name=full_name_expression('student__user__')
+        )
+    
     def get_student_name(self, obj):
-        return f"{obj.student.user.first_name} {obj.student.user.last_name}"
+        return obj._student_name
     get_student_name.short_description = 'Student'
+    get_student_name.admin_order_field = '_student_name'
 
 @admin.register(Message)
 class MessageAdmin(admin.ModelAdmin):
@@ -121,10 +183,18 @@ class MessageAdmin(admin.ModelAdmin):
     search_fields = ('sender__first_name', 'receiver__first_name', 'content')
     list_filter = ('read', 'created_at')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _sender_name=full_name_expression('sender__'),
+            _receiver_name=full_name_expression('receiver__')
+        )
+    
     def get_sender_name(self, obj):
-        return f"{obj.sender.first_name} {obj.sender.last_name}"
+        return obj._sender_name
     get_sender_name.short_description = 'Sender'
+    get_sender_name.admin_order_field = '_sender_name'
     
     def get_receiver_name(self, obj):
-        return f"{obj.receiver.first_name} {obj.receiver.last_name}"
-    get_receiver_name.short_description = 'Receiver'
\ No newline at end of file
+        return obj._receiver_name
+    get_receiver_name.short_description = 'Receiver'
+    get_receiver_name.admin_order_field = '_receiver_name'
\ No newline at end of file
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_student_final_grade_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attachment',
+            index=models.Index(fields=['start_date', 'end_date'], name='attachment_dates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='verificationstatus',
+            index=models.Index(fields=['is_verified', 'fee_verified'], name='verif_status_verified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weeklylog',
+            index=models.Index(fields=['week_number', 'date'], name='weekly_log_week_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reimbursement',
+            index=models.Index(fields=['status', 'created_at'], name='reimb_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['read', 'created_at'], name='message_read_created_idx'),
+        ),
+    ]
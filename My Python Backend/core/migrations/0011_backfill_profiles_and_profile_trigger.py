@@ -0,0 +1,103 @@
+# Generated by Django 5.2.4 on 2026-10-15 10:03
+
+from django.db import NotSupportedError, migrations
+
+
+# AFTER INSERT triggers that give every new user a Profile inside the database,
+# replacing the Python-side post_save hook (one fewer round-trip per user).
+PROFILE_TRIGGER_SQL = {
+    'postgresql': [
+        """
+        CREATE OR REPLACE FUNCTION core_user_create_profile() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO core_profile (id, user_id, first_name, last_name, created_at, updated_at)
+            VALUES (
+                gen_random_uuid(), NEW.id,
+                COALESCE(NULLIF(NEW.first_name, ''), 'Unknown'),
+                COALESCE(NULLIF(NEW.last_name, ''), 'User'),
+                now(), now()
+            )
+            ON CONFLICT (user_id) DO NOTHING;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE TRIGGER core_user_create_profile
+        AFTER INSERT ON core_user
+        FOR EACH ROW EXECUTE FUNCTION core_user_create_profile()
+        """,
+    ],
+    'sqlite': [
+        """
+        CREATE TRIGGER core_user_create_profile
+        AFTER INSERT ON core_user
+        FOR EACH ROW
+        WHEN NOT EXISTS (SELECT 1 FROM core_profile WHERE user_id = NEW.id)
+        BEGIN
+            INSERT INTO core_profile (id, user_id, first_name, last_name, created_at, updated_at)
+            VALUES (
+                lower(hex(randomblob(16))), NEW.id,
+                COALESCE(NULLIF(NEW.first_name, ''), 'Unknown'),
+                COALESCE(NULLIF(NEW.last_name, ''), 'User'),
+                strftime('%Y-%m-%d %H:%M:%f', 'now'),
+                strftime('%Y-%m-%d %H:%M:%f', 'now')
+            );
+        END
+        """,
+    ],
+}
+
+DROP_PROFILE_TRIGGER_SQL = {
+    'postgresql': [
+        'DROP TRIGGER IF EXISTS core_user_create_profile ON core_user',
+        'DROP FUNCTION IF EXISTS core_user_create_profile()',
+    ],
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS core_user_create_profile',
+    ],
+}
+
+
+def backfill_profiles(apps, schema_editor):
+    User = apps.get_model('core', 'User')
+    Profile = apps.get_model('core', 'Profile')
+    users = User.objects.filter(profile__isnull=True).only('id', 'first_name', 'last_name')
+    Profile.objects.bulk_create([
+        Profile(
+            user=user,
+            first_name=user.first_name or 'Unknown',
+            last_name=user.last_name or 'User',
+        )
+        for user in users
+    ], batch_size=1000)
+
+
+def create_profile_trigger(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in PROFILE_TRIGGER_SQL:
+        # User.save() no longer creates profiles, so without the trigger new
+        # users would silently end up with no Profile.
+        raise NotSupportedError(
+            f"No profile-creation trigger is defined for the '{vendor}' backend; "
+            "add one to PROFILE_TRIGGER_SQL before migrating."
+        )
+    for statement in PROFILE_TRIGGER_SQL[vendor]:
+        schema_editor.execute(statement, params=None)
+
+
+def drop_profile_trigger(apps, schema_editor):
+    for statement in DROP_PROFILE_TRIGGER_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_add_admin_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_profiles, migrations.RunPython.noop),
+        migrations.RunPython(create_profile_trigger, drop_profile_trigger),
+    ]
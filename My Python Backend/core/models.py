@@ -1,8 +1,12 @@
+import threading
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Avg
 from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
-from django.db.models.signals import post_save
+from django.utils.functional import cached_property
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 class User(AbstractUser):
@@ -17,33 +21,13 @@ class User(AbstractUser):
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
+    # Role validity is enforced by the field's choices and email uniqueness by
+    # its UNIQUE index (surfaced through full_clean's validate_unique), so no
+    # custom clean() is needed.
     
-    def save(self, *args, **kwargs):
-        """Override save to enforce data integrity"""
-        super().save(*args, **kwargs)
-        
-        # Auto-create Profile if it doesn't exist
-        if not hasattr(self, 'profile'):
-            Profile.objects.get_or_create(
-                user=self,
-                defaults={
-                    'first_name': self.first_name or 'Unknown',
-                    'last_name': self.last_name or 'User',
-                }
-            )
-    
-    def clean(self):
-        """Validate user data integrity"""
-        from django.core.exceptions import ValidationError
-        super().clean()
-        
-        # Validate role consistency
-        if self.role not in ['admin', 'student', 'supervisor', 'dean']:
-            raise ValidationError(f'Invalid role: {self.role}')
-        
-        # Check for existing users with same email
-        if User.objects.filter(email=self.email).exclude(pk=self.pk).exists():
-            raise ValidationError('User with this email already exists')
+    @cached_property
+    def full_name(self):
+        return f"{self.first_name} {self.last_name}"
 
 class Profile(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -92,7 +76,11 @@ class Student(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.student_id} - {self.user.first_name} {self.user.last_name}"
+        return f"{self.student_id} - {self.full_name}"
+    
+    @cached_property
+    def full_name(self):
+        return self.user.full_name
     
     def is_eligible_for_attachment(self):
         """
@@ -112,65 +100,73 @@ class Student(models.Model):
         Each lecturer's evaluation contributes 50% to the final grade
         """
         from decimal import Decimal
-        evaluations = self.evaluations.all()
+        # Average per lecturer (in case they have multiple evaluations), grouped in SQL
+        lecturer_averages = {
+            str(lecturer_id): average
+            for lecturer_id, average in self.evaluations.order_by()
+                .values('evaluator_id')
+                .annotate(average=Avg('total'))
+                .values_list('evaluator_id', 'average')
+        }
         
-        if evaluations.count() == 0:
+        if not lecturer_averages:
             return None
-            
-        lecturer_grades = {}
-        
-        # Group evaluations by evaluator (lecturer)
-        for evaluation in evaluations:
-            lecturer_id = evaluation.evaluator.id
-            if lecturer_id not in lecturer_grades:
-                lecturer_grades[lecturer_id] = []
-            lecturer_grades[lecturer_id].append(evaluation.total)
-        
-        # Calculate average for each lecturer (in case they have multiple evaluations)
-        lecturer_averages = {}
-        for lecturer_id, grades in lecturer_grades.items():
-            lecturer_averages[str(lecturer_id)] = sum(grades) / len(grades)
         
         # If we have exactly 2 lecturers, convert each to 50-point scale and combine
         if len(lecturer_averages) == 2:
             grade1, grade2 = list(lecturer_averages.values())
             # Convert each grade from 110-point scale to 50-point scale
-            contribution1 = (Decimal(grade1) / 110) * 50
-            contribution2 = (Decimal(grade2) / 110) * 50
+            # (floats are ample for a 2-decimal result; Decimal only for the column)
+            contribution1 = grade1 / 110 * 50
+            contribution2 = grade2 / 110 * 50
             final_grade = contribution1 + contribution2
             
-            self.final_grade = final_grade
-            self.grade_calculation_details = {
+            self._save_grade(Decimal(f'{final_grade:.2f}'), {
                 'calculation_method': '50_50_split',
                 'lecturer_grades_raw': lecturer_averages,
                 'lecturer_contributions': {
-                    'lecturer1_contribution': float(contribution1),
-                    'lecturer2_contribution': float(contribution2)
+                    'lecturer1_contribution': contribution1,
+                    'lecturer2_contribution': contribution2
                 },
-                'final_grade': float(final_grade),
+                'final_grade': final_grade,
                 'max_possible_score': 100,
                 'calculated_at': timezone.now().isoformat()
-            }
-            self.save()
-            return float(final_grade)
+            })
+            return final_grade
             
         # If only one lecturer, convert to 100-point scale (their contribution counts as 100%)
         elif len(lecturer_averages) == 1:
             grade = list(lecturer_averages.values())[0]
             # Convert from 110-point scale to 100-point scale
-            converted_grade = (Decimal(grade) / 110) * 100
-            self.final_grade = converted_grade
-            self.grade_calculation_details = {
+            converted_grade = grade / 110 * 100
+            self._save_grade(Decimal(f'{converted_grade:.2f}'), {
                 'calculation_method': 'single_lecturer',
                 'lecturer_grade_raw': grade,
-                'final_grade': float(converted_grade),
+                'final_grade': converted_grade,
                 'max_possible_score': 100,
                 'calculated_at': timezone.now().isoformat()
-            }
-            self.save()
-            return float(converted_grade)
+            })
+            return converted_grade
             
         return None
+    
+    def _save_grade(self, final_grade, details):
+        """
+        Write only the grade columns, bypassing a full-row save and its signals.
+        Skipped when nothing but the calculation timestamp would change.
+        """
+        previous = dict(self.grade_calculation_details or {})
+        previous.pop('calculated_at', None)
+        current = {key: value for key, value in details.items() if key != 'calculated_at'}
+        if self.final_grade == final_grade and previous == current:
+            return
+        
+        self.final_grade = final_grade
+        self.grade_calculation_details = details
+        Student.objects.filter(pk=self.pk).update(
+            final_grade=self.final_grade,
+            grade_calculation_details=self.grade_calculation_details,
+        )
 
 class Supervisor(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -180,7 +176,11 @@ class Supervisor(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"Supervisor: {self.user.first_name} {self.user.last_name}"
+        return f"Supervisor: {self.full_name}"
+    
+    @cached_property
+    def full_name(self):
+        return self.user.full_name
 
 class Company(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -213,6 +213,11 @@ class Attachment(models.Model):
     def __str__(self):
         return f"{self.student.user.first_name} at {self.company.name}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['start_date', 'end_date'], name='attachment_dates_idx'),
+        ]
+
 class SupervisorAssignment(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='supervisor_assignments')
@@ -238,6 +243,11 @@ class VerificationStatus(models.Model):
     def __str__(self):
         return f"Verification for {self.student.user.first_name}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_verified', 'fee_verified'], name='verif_status_verified_idx'),
+        ]
+
 class WeeklyLog(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='weekly_logs')
@@ -255,6 +265,11 @@ class WeeklyLog(models.Model):
     def __str__(self):
         return f"Week {self.week_number} - {self.student.user.first_name}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['week_number', 'date'], name='weekly_log_week_date_idx'),
+        ]
+
 class Evaluation(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     attachment = models.ForeignKey(Attachment, on_delete=models.CASCADE, related_name='evaluations', blank=True, null=True)
@@ -302,6 +317,11 @@ class Reimbursement(models.Model):
     def __str__(self):
         return f"Reimbursement for {self.student.user.first_name} - ${self.amount}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='reimb_status_created_idx'),
+        ]
+
 class Message(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
@@ -313,11 +333,63 @@ class Message(models.Model):
     def __str__(self):
         return f"Message from {self.sender.first_name} to {self.receiver.first_name}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['read', 'created_at'], name='message_read_created_idx'),
+        ]
+
+# Students whose grades are due for recalculation when the current transaction commits
+_pending_grades = threading.local()
+
+def _recalculate_final_grades(student_ids):
+    for student in Student.objects.filter(pk__in=student_ids):
+        student.calculate_final_grade()
+
+def _schedule_grade_recalculation(student_id):
+    """
+    Queue a grade recalculation for after commit, once per student per transaction
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _recalculate_final_grades([student_id])
+        return
+    
+    # run_on_commit is swapped for a fresh list on every commit or rollback, so a
+    # different list means the previous batch has already run or was discarded
+    batch = getattr(_pending_grades, 'batch', None)
+    if batch is not None and batch['hooks'] is connection.run_on_commit:
+        batch['student_ids'].add(student_id)
+        return
+    
+    batch = {'hooks': connection.run_on_commit, 'student_ids': {student_id}}
+    _pending_grades.batch = batch
+    
+    def flush():
+        _pending_grades.batch = None
+        _recalculate_final_grades(batch['student_ids'])
+    transaction.on_commit(flush)
+
 # Signal to automatically calculate final grade when evaluation is saved
 @receiver(post_save, sender=Evaluation)
 def update_student_final_grade(sender, instance, created, **kwargs):
     """
     Automatically recalculate student's final grade when an evaluation is saved
     """
-    if instance.student:
-        instance.student.calculate_final_grade()
\ No newline at end of file
+    if instance.student_id:
+        _schedule_grade_recalculation(instance.student_id)
+
+
+# Cache key for the check_data_integrity command's last run
+DATA_INTEGRITY_CACHE_KEY = 'check_data_integrity:issues'
+
+def invalidate_data_integrity_cache(sender, **kwargs):
+    """
+    Drop the cached integrity check when a user or one of their records changes
+    """
+    cache.delete(DATA_INTEGRITY_CACHE_KEY)
+
+for _model in (User, Profile, Student, Supervisor):
+    post_save.connect(invalidate_data_integrity_cache, sender=_model,
+                      dispatch_uid=f'invalidate_data_integrity_cache_{_model.__name__}_save')
+    post_delete.connect(invalidate_data_integrity_cache, sender=_model,
+                        dispatch_uid=f'invalidate_data_integrity_cache_{_model.__name__}_delete')
@@ -1,12 +1,31 @@
+import copy
+
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.db.models import Prefetch
 from .models import (
     User, Profile, Student, Supervisor, Company, Attachment,
     SupervisorAssignment, VerificationStatus, WeeklyLog, 
     Evaluation, Reimbursement, Message
 )
 
-class UserSerializer(serializers.ModelSerializer):
+# Per-class field dicts built by CachedFieldsSerializerMixin
+_FIELDS_CACHE = {}
+
+class CachedFieldsSerializerMixin:
+    """
+    Build a serializer class's fields once and hand out deep copies, so the
+    ModelSerializer introspection doesn't rerun for every (nested) instance.
+    Deep copies go through Field.__deepcopy__ like Serializer.get_fields does,
+    so nested (many=True) serializers get their own child bound to this one.
+    """
+    def get_fields(self):
+        cls = self.__class__
+        if cls not in _FIELDS_CACHE:
+            _FIELDS_CACHE[cls] = super().get_fields()
+        return copy.deepcopy(_FIELDS_CACHE[cls])
+
+class UserSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'email', 'first_name', 'last_name', 'role', 'is_active')
@@ -54,73 +73,103 @@ class LoginSerializer(serializers.Serializer):
             attrs['user'] = user
         return attrs
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
         model = Profile
         fields = '__all__'
 
-class StudentSerializer(serializers.ModelSerializer):
+class UserNameSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('first_name', 'last_name')
+
+class CompanyInlineSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Company
+        fields = ('id', 'name', 'location', 'industry')
+
+class SupervisorInlineSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    user = UserNameSerializer(read_only=True)
+
+    class Meta:
+        model = Supervisor
+        fields = ('id', 'user')
+
+class AttachmentInlineSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    """Attachment as listed under a student"""
+    company = CompanyInlineSerializer(read_only=True)
+    supervisor = SupervisorInlineSerializer(read_only=True)
+
+    class Meta:
+        model = Attachment
+        fields = ('id', 'company', 'start_date', 'end_date', 'supervisor')
+
+class VerificationStatusInlineSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    """Verification status as embedded in a student"""
+    class Meta:
+        model = VerificationStatus
+        fields = (
+            'id', 'is_verified', 'fee_verified', 'verification_date',
+            'fee_verification_date', 'verification_details', 'created_at', 'updated_at',
+        )
+
+class StudentSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
-    verification_status = serializers.SerializerMethodField()
-    attachments = serializers.SerializerMethodField()
+    # A missing verification status (reverse one-to-one) renders as None
+    verification_status = VerificationStatusInlineSerializer(read_only=True)
+    attachments = AttachmentInlineSerializer(many=True, read_only=True)
     
     class Meta:
         model = Student
         fields = '__all__'
     
-    def get_verification_status(self, obj):
-        try:
-            verification = obj.verification_status
-            return {
-                'id': verification.id,
-                'is_verified': verification.is_verified,
-                'fee_verified': verification.fee_verified,
-                'verification_date': verification.verification_date,
-                'fee_verification_date': verification.fee_verification_date,
-                'verification_details': verification.verification_details,
-                'created_at': verification.created_at,
-                'updated_at': verification.updated_at,
-            }
-        except VerificationStatus.DoesNotExist:
-            return None
-    
-    def get_attachments(self, obj):
-        attachments = obj.attachments.all()
-        return [{
-            'id': attachment.id,
-            'company': {
-                'id': attachment.company.id,
-                'name': attachment.company.name,
-                'location': attachment.company.location,
-                'industry': attachment.company.industry,
-            } if attachment.company else None,
-            'start_date': attachment.start_date,
-            'end_date': attachment.end_date,
-            'supervisor': {
-                'id': attachment.supervisor.id,
-                'user': {
-                    'first_name': attachment.supervisor.user.first_name,
-                    'last_name': attachment.supervisor.user.last_name,
-                }
-            } if attachment.supervisor else None,
-        } for attachment in attachments]
-
-class SupervisorSerializer(serializers.ModelSerializer):
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load every relation this serializer reads in a fixed number of queries"""
+        return queryset.select_related('user', 'verification_status').prefetch_related(
+            Prefetch(
+                'attachments',
+                queryset=Attachment.objects.select_related('company', 'supervisor__user').only(
+                    # Just the columns AttachmentInlineSerializer reads
+                    'id', 'student', 'start_date', 'end_date',
+                    'company__id', 'company__name', 'company__location', 'company__industry',
+                    'supervisor__id', 'supervisor__user__id',
+                    'supervisor__user__first_name', 'supervisor__user__last_name',
+                )
+            )
+        )
+
+class StudentSummarySerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    """
+    Student as embedded in other resources: its own columns and user, without
+    the verification status and attachments StudentSerializer adds per row
+    """
+    user = UserSerializer(read_only=True)
+
+    class Meta:
+        model = Student
+        fields = '__all__'
+
+class SupervisorSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
         model = Supervisor
         fields = '__all__'
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related('user')
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Company
         fields = '__all__'
 
-class AttachmentSerializer(serializers.ModelSerializer):
-    student = StudentSerializer(read_only=True)
+class AttachmentSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    student = StudentSummarySerializer(read_only=True)
     company = CompanySerializer(read_only=True)
     supervisor = SupervisorSerializer(read_only=True)
     
@@ -134,35 +183,35 @@ class AttachmentSerializer(serializers.ModelSerializer):
         fields = '__all__'
     
 
-class SupervisorAssignmentSerializer(serializers.ModelSerializer):
-    student_detail = StudentSerializer(source='student', read_only=True)
+class SupervisorAssignmentSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    student_detail = StudentSummarySerializer(source='student', read_only=True)
     supervisor_detail = SupervisorSerializer(source='supervisor', read_only=True)
 
     class Meta:
         model = SupervisorAssignment
         fields = '__all__'
 
-class VerificationStatusSerializer(serializers.ModelSerializer):
-    student = StudentSerializer(read_only=True)
+class VerificationStatusSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    student = StudentSummarySerializer(read_only=True)
 
     class Meta:
         model = VerificationStatus
         fields = '__all__'
 
-class WeeklyLogSerializer(serializers.ModelSerializer):
-    student = StudentSerializer(read_only=True)
+class WeeklyLogSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    student = StudentSummarySerializer(read_only=True)
 
     class Meta:
         model = WeeklyLog
         fields = '__all__'
 
-class EvaluationSerializer(serializers.ModelSerializer):
-    student = StudentSerializer(read_only=True)
+class EvaluationSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    student = StudentSummarySerializer(read_only=True)
     supervisor = SupervisorSerializer(read_only=True)
     evaluator = UserSerializer(read_only=True)
     attachment = AttachmentSerializer(read_only=True)
     
-    # Add write-only fields for IDs
+    # Write-only IDs, saved straight to the FK columns without fetching the rows
     student_id = serializers.UUIDField(write_only=True, required=True)
     supervisor_id = serializers.UUIDField(write_only=True, required=True)
     attachment_id = serializers.UUIDField(write_only=True, required=False)
@@ -170,29 +219,13 @@ class EvaluationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Evaluation
         fields = '__all__'
-    
-    def create(self, validated_data):
-        # Extract ID fields and convert to objects
-        student_id = validated_data.pop('student_id', None)
-        supervisor_id = validated_data.pop('supervisor_id', None)
-        attachment_id = validated_data.pop('attachment_id', None)
-        
-        # Get the actual objects
-        if student_id:
-            validated_data['student'] = Student.objects.get(id=student_id)
-        if supervisor_id:
-            validated_data['supervisor'] = Supervisor.objects.get(id=supervisor_id)
-        if attachment_id:
-            validated_data['attachment'] = Attachment.objects.get(id=attachment_id)
-            
-        return super().create(validated_data)
-
-class ReimbursementSerializer(serializers.ModelSerializer):
-    student = StudentSerializer(read_only=True)
+
+class ReimbursementSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
+    student = StudentSummarySerializer(read_only=True)
     company = CompanySerializer(read_only=True)
     supervisor = SupervisorSerializer(read_only=True)
     
-    # Add write-only fields for IDs
+    # Write-only IDs, saved straight to the FK columns without fetching the rows
     student_id = serializers.UUIDField(write_only=True, required=True)
     company_id = serializers.UUIDField(write_only=True, required=True)
     supervisor_id = serializers.UUIDField(write_only=True, required=True)
@@ -200,24 +233,8 @@ class ReimbursementSerializer(serializers.ModelSerializer):
     class Meta:
         model = Reimbursement
         fields = '__all__'
-    
-    def create(self, validated_data):
-        # Extract ID fields and convert to objects
-        student_id = validated_data.pop('student_id', None)
-        company_id = validated_data.pop('company_id', None)
-        supervisor_id = validated_data.pop('supervisor_id', None)
-        
-        # Get the actual objects
-        if student_id:
-            validated_data['student'] = Student.objects.get(id=student_id)
-        if company_id:
-            validated_data['company'] = Company.objects.get(id=company_id)
-        if supervisor_id:
-            validated_data['supervisor'] = Supervisor.objects.get(id=supervisor_id)
-            
-        return super().create(validated_data)
-
-class MessageSerializer(serializers.ModelSerializer):
+
+class MessageSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     sender = UserSerializer(read_only=True)
     receiver = UserSerializer(read_only=True)
     receiver_id = serializers.UUIDField(write_only=True)
@@ -229,15 +246,11 @@ class MessageSerializer(serializers.ModelSerializer):
             'receiver': {'read_only': True}
         }
 
-    def create(self, validated_data):
-        receiver_id = validated_data.pop('receiver_id', None)
-        if receiver_id:
-            try:
-                receiver = User.objects.get(id=receiver_id)
-                validated_data['receiver'] = receiver
-            except User.DoesNotExist:
-                raise serializers.ValidationError({'receiver_id': 'User not found'})
-        return super().create(validated_data)
+    def validate_receiver_id(self, value):
+        # receiver_id is then written straight to the FK column on create
+        if not User.objects.filter(id=value).exists():
+            raise serializers.ValidationError('User not found')
+        return value
 
 class ForgotPasswordSerializer(serializers.Serializer):
     email = serializers.EmailField()
@@ -2,58 +2,97 @@
 Comprehensive Enhanced OCR System for Academic Document Verification
 Implements multiple extraction methods based on document type for maximum accuracy:
 - Digital PDFs: PyMuPDF, pdfminer, pdfplumber
-- Scanned PDFs: pdf2image + Tesseract/DocTR
+- Scanned PDFs: PyMuPDF rasterization + Tesseract/DocTR
 - Tables/layouts: pdfplumber, PyMuPDF with layout parsing
 - Browser fallback: pdfjs-dist integration ready
 """
 
 import io
 import logging
+import os
+import threading
 import time
 import json
 import base64
+from importlib.util import find_spec
+from contextlib import ExitStack
 from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-# PDF Processing Libraries
-import fitz  # PyMuPDF
-import pdfplumber
-from pdfminer.high_level import extract_text as pdfminer_extract_text
-from pdfminer.layout import LAParams
-from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
-from pdfminer.converter import PDFPageAggregator
-from pdfminer.layout import LAParams, LTTextContainer, LTTextBox, LTTextLine, LTChar
-
-# Image/OCR Libraries
-try:
-    import pdf2image
-    from pdf2image import convert_from_bytes
-    PDF2IMAGE_AVAILABLE = True
-except ImportError:
-    PDF2IMAGE_AVAILABLE = False
-    
-import pytesseract
-from PIL import Image, ImageEnhance, ImageFilter
-import cv2
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
-# Advanced OCR (DocTR)
-try:
-    from doctr.io import DocumentFile
-    from doctr.models import ocr_predictor
-    DOCTR_AVAILABLE = True
-except ImportError:
-    DOCTR_AVAILABLE = False
+# The PDF, OCR and imaging libraries (fitz, pdfplumber, pdfminer, pytesseract,
+# PIL, cv2, doctr) are imported inside the methods that use them,
+# so importing this module doesn't load them into every worker up front.
+
+DOCTR_AVAILABLE = find_spec('doctr') is not None
+# In-process Tesseract bindings; pytesseract (one subprocess per call) otherwise
+TESSEROCR_AVAILABLE = find_spec('tesserocr') is not None
 
 # Text Processing
 import re
-from difflib import SequenceMatcher
-from collections import defaultdict, Counter
+from collections import defaultdict, deque, Counter
+from itertools import islice, zip_longest
 
 logger = logging.getLogger(__name__)
 
+WORD_RE = re.compile(r'\b\w+\b')
+NON_BLANK_LINE_RE = re.compile(r'^.*\S', re.MULTILINE)
+
+# Pages OCR'd concurrently by the pytesseract paths. Tesseract already uses a
+# few threads per page itself, so only a share of the cores is used
+OCR_PAGE_WORKERS = max(1, (os.cpu_count() or 1) // 4)
+
+# Longest page side (pixels) fed to Tesseract. A4 and Letter at 300 dpi fit
+# (3508 px); larger scans are rendered at a lower dpi, since Tesseract's time
+# grows with the pixel count while their text is big enough already
+TESSERACT_MAX_LONG_EDGE = 3600
+
+# Pages per DocTR forward pass, and the longest page side (pixels) fed to it.
+# DocTR resizes its input for detection anyway, so oversized pages (A3,
+# posters) are rendered below 200 dpi instead of as huge arrays
+DOCTR_BATCH_SIZE = 4
+DOCTR_MAX_LONG_EDGE = 2048
+
+# Tables with more rows than this are written without column padding
+TABLE_ALIGN_MAX_ROWS = 10000
+
+# DocTR predictor, loaded on first use and shared by all instances
+_DOCTR_MODEL = None
+_DOCTR_LOADED = False
+_DOCTR_LOCK = threading.Lock()
+
+def get_doctr_model():
+    """Return the shared DocTR predictor, or None if it can't be loaded"""
+    global _DOCTR_MODEL, _DOCTR_LOADED
+    if _DOCTR_LOADED:
+        return _DOCTR_MODEL
+    with _DOCTR_LOCK:
+        if not _DOCTR_LOADED:
+            if DOCTR_AVAILABLE:
+                try:
+                    from doctr.models import ocr_predictor
+                    _DOCTR_MODEL = ocr_predictor(pretrained=True)
+                    logger.info("DocTR model loaded successfully")
+                except Exception as e:
+                    logger.warning(f"Failed to load DocTR model: {e}")
+            else:
+                logger.info("DocTR not available, falling back to Tesseract only")
+            _DOCTR_LOADED = True
+    return _DOCTR_MODEL
+
+# PIL's SMOOTH filter, as used by ImageEnhance.Sharpness
+_SMOOTH_KERNEL = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], dtype=np.float32) / 13
+_SHARPEN_KERNEL = 2 * np.array([[0, 0, 0], [0, 1, 0], [0, 0, 0]], dtype=np.float32) - _SMOOTH_KERNEL
+# ImageEnhance.Contrast(1.5) followed by Sharpness(2.0), up to mean offset
+_CONTRAST_SHARPEN_KERNEL = 1.5 * _SHARPEN_KERNEL
+
+# Median gray-level difference between a page and its 3x3 median blur above
+# which the page counts as noisy (clean scans are ~0: flat background)
+NOISY_PAGE_THRESHOLD = 2
+
 @dataclass
 class ExtractionMethod:
     """Information about an extraction method"""
@@ -64,6 +103,7 @@ class ExtractionMethod:
     text_length: int
     success: bool
     error: Optional[str] = None
+    text: str = ""  # The extracted text, so it needn't be extracted again
 
 @dataclass
 class EnhancedExtractionResult:
@@ -98,44 +138,61 @@ class ComprehensiveEnhancedOCR:
     Advanced OCR system implementing multiple extraction strategies
     """
     
-    def __init__(self):
-        self.tesseract_configs = {
-            'default': '--psm 1 --oem 3',
-            'single_block': '--psm 6 --oem 3',
-            'single_line': '--psm 7 --oem 3',
-            'single_word': '--psm 8 --oem 3',
-            'table': '--psm 6 --oem 3 -c preserve_interword_spaces=1',
-            'academic': '--psm 1 --oem 3 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789.,;:()/- +'
-        }
-        
-        # Academic document patterns
-        self.academic_patterns = {
-            'course_codes': r'[A-Z]{2,4}\s*\d{3,4}[A-Z]?',
-            'grades': r'[A-F][+-]?|Pass|Fail|Credit|Distinction|HD|D|CR|P|F|W|WD|WF',
-            'units': r'\d+\.?\d*\s*(?:units?|credits?|hrs?|hours?)',
-            'gpa': r'(?:GPA|CGPA|WAM)[\s:]*\d+\.?\d*',
-            'academic_terms': r'(?:Semester|Term|Quarter|Year|Session)\s*\d+',
-            'student_info': r'(?:Student|ID|Name|Program|Degree)[\s:]+[A-Za-z0-9\s]+',
-            'transcript_headers': r'(?:Academic\s+)?(?:Transcript|Record|Statement)',
-            'institutions': r'(?:University|College|Institute|School)\s+of\s+[A-Za-z\s]+'
-        }
-        
-        # Initialize DocTR model if available
-        if DOCTR_AVAILABLE:
-            try:
-                self.doctr_model = ocr_predictor(pretrained=True)
-                logger.info("DocTR model loaded successfully")
-            except Exception as e:
-                logger.warning(f"Failed to load DocTR model: {e}")
-                self.doctr_model = None
-        else:
-            self.doctr_model = None
-            logger.info("DocTR not available, falling back to Tesseract only")
+    ACADEMIC_CHAR_WHITELIST = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789.,;:()/- +'
+    
+    # Shared by every instance; HybridDocumentParser builds one per request
+    tesseract_configs = {
+        'default': '--psm 1 --oem 3',
+        'single_block': '--psm 6 --oem 3',
+        'single_line': '--psm 7 --oem 3',
+        'single_word': '--psm 8 --oem 3',
+        'table': '--psm 6 --oem 3 -c preserve_interword_spaces=1',
+        'academic': f'--psm 1 --oem 3 -c tessedit_char_whitelist={ACADEMIC_CHAR_WHITELIST}'
+    }
+    
+    # Tesseract configs tried per page in order, best confidence wins; the
+    # later ones only run while the page is below GOOD_PAGE_CONFIDENCE
+    GOOD_PAGE_CONFIDENCE = 0.75
+    PAGE_OCR_CONFIGS = (
+        ('academic', tesseract_configs['academic']),
+        ('default', tesseract_configs['default']),
+        ('table', tesseract_configs['table']),
+    )
+    
+    # The same configs as tesserocr (psm, variables)
+    TESSEROCR_PAGE_SETTINGS = {
+        'academic': (1, {'tessedit_char_whitelist': ACADEMIC_CHAR_WHITELIST}),
+        'default': (1, {}),
+        'table': (6, {'preserve_interword_spaces': '1'}),
+    }
+    
+    # Academic document patterns
+    academic_patterns = {
+        'course_codes': r'[A-Z]{2,4}\s*\d{3,4}[A-Z]?',
+        'grades': r'[A-F][+-]?|Pass|Fail|Credit|Distinction|HD|D|CR|P|F|W|WD|WF',
+        'units': r'\d+\.?\d*\s*(?:units?|credits?|hrs?|hours?)',
+        'gpa': r'(?:GPA|CGPA|WAM)[\s:]*\d+\.?\d*',
+        'academic_terms': r'(?:Semester|Term|Quarter|Year|Session)\s*\d+',
+        'student_info': r'(?:Student|ID|Name|Program|Degree)[\s:]+[A-Za-z0-9\s]+',
+        'transcript_headers': r'(?:Academic\s+)?(?:Transcript|Record|Statement)',
+        'institutions': r'(?:University|College|Institute|School)\s+of\s+[A-Za-z\s]+'
+    }
+    _academic_res = {
+        name: re.compile(pattern, re.IGNORECASE)
+        for name, pattern in academic_patterns.items()
+    }
+
+    @property
+    def doctr_model(self):
+        """DocTR predictor, loaded on the first OCR call that needs it"""
+        return get_doctr_model()
 
     def analyze_document(self, pdf_bytes: bytes) -> DocumentAnalysis:
         """
         Comprehensive document analysis to determine optimal extraction strategy
         """
+        import fitz  # PyMuPDF
+        
         start_time = time.time()
         analysis_details = defaultdict(list)
         
@@ -143,8 +200,10 @@ class ComprehensiveEnhancedOCR:
             doc = fitz.open(stream=pdf_bytes, filetype="pdf")
             page_count = len(doc)
             
-            # Analyze first few pages for performance
+            # Analyze first few pages for performance, stopping early once
+            # the pages agree on digital vs scanned
             pages_to_analyze = min(5, page_count)
+            pages_analyzed = 0
             
             total_text_blocks = 0
             total_image_blocks = 0
@@ -172,17 +231,21 @@ class ComprehensiveEnhancedOCR:
                 complex_layout_indicators += page_analysis['complex_layout_score']
                 
                 analysis_details['page_analyses'].append(page_analysis)
+                pages_analyzed += 1
+                
+                if self._is_conclusive(digital_indicators, scanned_indicators):
+                    break
             
             doc.close()
             
             # Calculate averages and make determinations
-            avg_text_coverage = total_text_coverage / pages_to_analyze
-            avg_image_coverage = (total_image_blocks / pages_to_analyze) * 10  # Rough estimate
+            avg_text_coverage = total_text_coverage / pages_analyzed
+            avg_image_coverage = (total_image_blocks / pages_analyzed) * 10  # Rough estimate
             
             is_digital = digital_indicators > scanned_indicators
             is_scanned = scanned_indicators > digital_indicators
-            has_tables = table_indicators > pages_to_analyze * 2  # At least 2 table indicators per page
-            has_complex_layout = complex_layout_indicators > pages_to_analyze
+            has_tables = table_indicators > pages_analyzed * 2  # At least 2 table indicators per page
+            has_complex_layout = complex_layout_indicators > pages_analyzed
             
             # Determine recommended method
             if is_digital and has_tables:
@@ -202,6 +265,7 @@ class ComprehensiveEnhancedOCR:
             
             analysis_details.update({
                 'processing_time': time.time() - start_time,
+                'pages_analyzed': pages_analyzed,
                 'digital_indicators': digital_indicators,
                 'scanned_indicators': scanned_indicators,
                 'table_indicators': table_indicators,
@@ -236,6 +300,14 @@ class ComprehensiveEnhancedOCR:
                 analysis_details={'error': str(e)}
             )
 
+    def _is_conclusive(self, digital_indicators: int, scanned_indicators: int) -> bool:
+        """Whether the pages seen so far leave no doubt about the document type:
+        a full page's worth of one kind of evidence and none of the other"""
+        return (
+            (digital_indicators >= 3 and scanned_indicators == 0) or
+            (scanned_indicators >= 3 and digital_indicators == 0)
+        )
+
     def _analyze_page(self, page, page_num: int) -> Dict[str, Any]:
         """Analyze individual page characteristics"""
         analysis = {
@@ -260,62 +332,52 @@ class ComprehensiveEnhancedOCR:
             images = page.get_images()
             analysis['image_blocks'] = len(images)
             
-            # Check for large images (scanned indicator)
+            # Check for large images (scanned indicator). get_images() already
+            # reports each image's /Width and /Height, so nothing is decoded.
             for img in images:
-                try:
-                    xref = img[0]
-                    pix = fitz.Pixmap(page.parent, xref)
-                    if pix.width > 1000 and pix.height > 1000:
-                        analysis['scanned_score'] += 2
-                    pix = None
-                except:
-                    pass
+                width, height = img[2], img[3]
+                if width > 1000 and height > 1000:
+                    analysis['scanned_score'] += 2
+            
+            # Walk the text dict once, collecting the plain text, font sizes
+            # and line positions used by the checks below
+            line_texts = []
+            font_sizes = set()
+            lines_with_coords = []
+            for block in text_blocks:
+                if 'lines' in block:
+                    for line in block['lines']:
+                        spans = line.get('spans', [])
+                        text = ''.join([span.get('text', '') for span in spans])
+                        font_sizes.update(span.get('size', 0) for span in spans)
+                        line_texts.append(text)
+                        if text.strip():
+                            bbox = line.get('bbox', [0, 0, 0, 0])
+                            lines_with_coords.append({
+                                'text': text.strip(),
+                                'y': bbox[1],
+                                'x': bbox[0],
+                                'width': bbox[2] - bbox[0]
+                            })
             
             # Text quality analysis
-            page_text = page.get_text()
+            page_text = '\n'.join(line_texts)
             if len(page_text.strip()) > 100:
                 analysis['digital_score'] += 1
                 analysis['text_coverage'] = len(page_text) / 2000  # Normalize
                 
                 # Check for academic patterns
-                pattern_matches = 0
-                for pattern_name, pattern in self.academic_patterns.items():
-                    matches = re.findall(pattern, page_text, re.IGNORECASE)
-                    if matches:
-                        pattern_matches += len(matches)
-                        if pattern_name == 'course_codes':
-                            analysis['table_score'] += 1
+                if self._academic_res['course_codes'].search(page_text):
+                    analysis['table_score'] += 1
                 
-                if pattern_matches > 5:
+                if self._has_academic_matches(page_text, 5):
                     analysis['digital_score'] += 2
             
             # Layout complexity analysis
-            font_sizes = set()
-            for block in text_blocks:
-                if 'lines' in block:
-                    for line in block['lines']:
-                        for span in line.get('spans', []):
-                            font_sizes.add(span.get('size', 0))
-            
             if len(font_sizes) > 5:  # Multiple font sizes suggest complex layout
                 analysis['complex_layout_score'] += 1
             
             # Table detection using text positioning
-            lines_with_coords = []
-            for block in text_blocks:
-                if 'lines' in block:
-                    for line in block['lines']:
-                        bbox = line.get('bbox', [0, 0, 0, 0])
-                        text = ''.join([span.get('text', '') for span in line.get('spans', [])])
-                        if text.strip():
-                            lines_with_coords.append({
-                                'text': text.strip(),
-                                'y': bbox[1],
-                                'x': bbox[0],
-                                'width': bbox[2] - bbox[0]
-                            })
-            
-            # Check for tabular data patterns
             if self._detect_table_patterns(lines_with_coords):
                 analysis['table_score'] += 2
                 analysis['table_candidates'] += 1
@@ -326,27 +388,33 @@ class ComprehensiveEnhancedOCR:
         
         return analysis
 
+    def _has_academic_matches(self, text: str, threshold: int) -> bool:
+        """Whether the academic patterns match more than ``threshold`` times,
+        stopping as soon as the count is exceeded"""
+        pattern_matches = 0
+        for compiled in self._academic_res.values():
+            for _ in compiled.finditer(text):
+                pattern_matches += 1
+                if pattern_matches > threshold:
+                    return True
+        return False
+
     def _detect_table_patterns(self, lines_with_coords: List[Dict]) -> bool:
         """Detect if lines form table-like patterns"""
         if len(lines_with_coords) < 3:
             return False
         
-        # Group lines by Y coordinate (rows)
-        y_groups = defaultdict(list)
-        for line in lines_with_coords:
-            y_rounded = round(line['y'], -1)  # Round to nearest 10
-            y_groups[y_rounded].append(line)
+        # Group lines by Y coordinate (rows), rounded to nearest 10
+        ys = np.fromiter((line['y'] for line in lines_with_coords), dtype=np.float64,
+                         count=len(lines_with_coords))
+        _, row_sizes = np.unique(np.round(ys, -1), return_counts=True)
         
         # Check for consistent column alignment
-        row_count = len(y_groups)
-        if row_count < 3:
+        if len(row_sizes) < 3:
             return False
         
-        # Look for rows with multiple aligned elements
-        aligned_rows = 0
-        for y, row_lines in y_groups.items():
-            if len(row_lines) >= 3:  # At least 3 columns
-                aligned_rows += 1
+        # Look for rows with multiple aligned elements (at least 3 columns)
+        aligned_rows = int((row_sizes >= 3).sum())
         
         return aligned_rows >= 2  # At least 2 rows with 3+ columns
 
@@ -357,16 +425,13 @@ class ComprehensiveEnhancedOCR:
         errors = []
         
         # Method 1: PyMuPDF with enhanced text extraction
-        pymupdf_result = self._extract_with_pymupdf_enhanced(pdf_bytes)
-        methods_tried.append(pymupdf_result)
-        
         # Method 2: pdfplumber with table extraction
-        pdfplumber_result = self._extract_with_pdfplumber_enhanced(pdf_bytes)
-        methods_tried.append(pdfplumber_result)
-        
         # Method 3: pdfminer with layout analysis
-        pdfminer_result = self._extract_with_pdfminer_enhanced(pdf_bytes)
-        methods_tried.append(pdfminer_result)
+        methods_tried.extend(self._run_extractors(pdf_bytes, [
+            self._extract_with_pymupdf_enhanced,
+            self._extract_with_pdfplumber_enhanced,
+            self._extract_with_pdfminer_enhanced,
+        ]))
         
         # Choose best result
         successful_methods = [m for m in methods_tried if m.success and m.confidence > 0.1]
@@ -389,7 +454,7 @@ class ComprehensiveEnhancedOCR:
                 extracted_tables.extend(method.tables)
         
         # Get actual text from best method (placeholder logic)
-        final_text = self._get_method_text(pdf_bytes, primary_method)
+        final_text = self._get_method_text(pdf_bytes, primary_method, methods_tried=methods_tried)
         
         processing_time = time.time() - start_time
         
@@ -416,19 +481,22 @@ class ComprehensiveEnhancedOCR:
         methods_tried = []
         errors = []
         
-        # Method 1: pdf2image + Tesseract with preprocessing
-        if PDF2IMAGE_AVAILABLE:
-            tesseract_result = self._extract_with_tesseract_enhanced(pdf_bytes)
-            methods_tried.append(tesseract_result)
+        extractors = []
+        
+        # Method 1: Tesseract with preprocessing
+        extractors.append(self._extract_with_tesseract_enhanced)
         
         # Method 2: DocTR if available
         if self.doctr_model:
-            doctr_result = self._extract_with_doctr(pdf_bytes)
-            methods_tried.append(doctr_result)
+            extractors.append(self._extract_with_doctr)
         
         # Method 3: PyMuPDF OCR as fallback
-        pymupdf_ocr_result = self._extract_with_pymupdf_ocr(pdf_bytes)
-        methods_tried.append(pymupdf_ocr_result)
+        extractors.append(self._extract_with_pymupdf_ocr)
+        
+        # One method at a time: they all rasterize with PyMuPDF, whose global
+        # context can't be used from several threads at once (each method
+        # already OCRs its pages in parallel once they're rendered)
+        methods_tried.extend(extractor(pdf_bytes) for extractor in extractors)
         
         # Choose best result
         successful_methods = [m for m in methods_tried if m.success and m.confidence > 0.05]
@@ -441,7 +509,7 @@ class ComprehensiveEnhancedOCR:
             confidence = 0.0
         
         # Get final text
-        final_text = self._get_method_text(pdf_bytes, primary_method, is_ocr=True)
+        final_text = self._get_method_text(pdf_bytes, primary_method, is_ocr=True, methods_tried=methods_tried)
         
         processing_time = time.time() - start_time
         
@@ -456,7 +524,7 @@ class ComprehensiveEnhancedOCR:
             metadata={
                 'extraction_strategy': 'advanced_ocr',
                 'ocr_methods_available': {
-                    'tesseract': PDF2IMAGE_AVAILABLE,
+                    'tesseract': True,
                     'doctr': self.doctr_model is not None,
                     'pymupdf_ocr': True
                 }
@@ -465,23 +533,41 @@ class ComprehensiveEnhancedOCR:
             structured_data=self._extract_structured_data(final_text)
         )
 
+    def _run_extractors(self, pdf_bytes: bytes, extractors: List) -> List[ExtractionMethod]:
+        """Run independent extraction methods concurrently, keeping their order.
+        
+        At most one of the extractors may use PyMuPDF: MuPDF shares one global
+        context between documents and isn't safe to call from several threads.
+        pdfplumber and pdfminer are pure Python and hold the GIL, so the gain
+        is overlapping them with MuPDF's C code, not running them in parallel.
+        """
+        if len(extractors) < 2:
+            return [extractor(pdf_bytes) for extractor in extractors]
+        
+        with ThreadPoolExecutor(max_workers=len(extractors)) as executor:
+            futures = [executor.submit(extractor, pdf_bytes) for extractor in extractors]
+            return [future.result() for future in futures]
+
     def _extract_with_pymupdf_enhanced(self, pdf_bytes: bytes) -> ExtractionMethod:
         """Enhanced PyMuPDF extraction with layout analysis"""
+        import fitz  # PyMuPDF
+        
         start_time = time.time()
         try:
             doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            text_parts = []
+            text_buffer = io.StringIO()
             
             for page_num in range(min(len(doc), 20)):
                 page = doc[page_num]
                 
-                # Get text with formatting information
-                blocks = page.get_text("dict")
+                # Block-level text, already joined into lines by PyMuPDF
+                blocks = page.get_text("blocks")
                 page_text = self._process_pymupdf_blocks(blocks)
-                text_parts.append(f"\n--- Page {page_num + 1} ---\n{page_text}")
+                text_buffer.write(f"\n--- Page {page_num + 1} ---\n")
+                text_buffer.write(page_text)
             
             doc.close()
-            combined_text = "".join(text_parts)
+            combined_text = text_buffer.getvalue()
             confidence = self._calculate_text_quality(combined_text)
             
             return ExtractionMethod(
@@ -490,7 +576,8 @@ class ComprehensiveEnhancedOCR:
                 confidence=confidence,
                 processing_time=time.time() - start_time,
                 text_length=len(combined_text),
-                success=True
+                success=True,
+                text=combined_text
             )
             
         except Exception as e:
@@ -506,15 +593,19 @@ class ComprehensiveEnhancedOCR:
 
     def _extract_with_pdfplumber_enhanced(self, pdf_bytes: bytes) -> ExtractionMethod:
         """Enhanced pdfplumber extraction with table detection"""
+        import pdfplumber
+        
         start_time = time.time()
         try:
-            text_parts = []
+            text_buffer = io.StringIO()
             tables = []
             
             with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
                 for page_num, page in enumerate(pdf.pages[:20]):
-                    # Extract regular text
-                    page_text = page.extract_text() or ""
+                    # Extract regular text (simple, non-layout mode) and tables;
+                    # both read the page's char objects, which are parsed once
+                    # and cached on the page
+                    page_text = page.extract_text(layout=False) or ""
                     
                     # Extract tables
                     page_tables = page.extract_tables()
@@ -532,9 +623,14 @@ class ComprehensiveEnhancedOCR:
                             table_text = self._table_to_text(table)
                             page_text += f"\n\n[TABLE {table_idx + 1}]\n{table_text}\n"
                     
-                    text_parts.append(f"\n--- Page {page_num + 1} ---\n{page_text}")
+                    text_buffer.write(f"\n--- Page {page_num + 1} ---\n")
+                    
+                    text_buffer.write(page_text)
+                    
+                    # Drop the page's parsed chars/objects before the next page
+                    page.flush_cache()
             
-            combined_text = "".join(text_parts)
+            combined_text = text_buffer.getvalue()
             confidence = self._calculate_text_quality(combined_text)
             
             method = ExtractionMethod(
@@ -543,7 +639,8 @@ class ComprehensiveEnhancedOCR:
                 confidence=confidence,
                 processing_time=time.time() - start_time,
                 text_length=len(combined_text),
-                success=True
+                success=True,
+                text=combined_text
             )
             method.tables = tables  # Add tables to method object
             return method
@@ -561,9 +658,13 @@ class ComprehensiveEnhancedOCR:
 
     def _extract_with_pdfminer_enhanced(self, pdf_bytes: bytes) -> ExtractionMethod:
         """Enhanced pdfminer extraction with layout parameters"""
+        from pdfminer.high_level import extract_text as pdfminer_extract_text
+        from pdfminer.layout import LAParams
+        
         start_time = time.time()
         try:
-            # Try different layout parameters
+            # Try different layout parameters; the later ones only run while
+            # the text is below GOOD_PAGE_CONFIDENCE
             laparams_configs = [
                 LAParams(word_margin=0.1, char_margin=2.0, line_margin=0.5, boxes_flow=0.5),
                 LAParams(word_margin=0.2, char_margin=1.0, line_margin=0.3, boxes_flow=0.7),
@@ -582,6 +683,9 @@ class ComprehensiveEnhancedOCR:
                         best_confidence = confidence
                 except:
                     continue
+                
+                if best_confidence >= self.GOOD_PAGE_CONFIDENCE:
+                    break
             
             return ExtractionMethod(
                 name="pdfminer_enhanced",
@@ -589,7 +693,8 @@ class ComprehensiveEnhancedOCR:
                 confidence=best_confidence,
                 processing_time=time.time() - start_time,
                 text_length=len(best_text),
-                success=best_confidence > 0
+                success=best_confidence > 0,
+                text=best_text
             )
             
         except Exception as e:
@@ -604,73 +709,61 @@ class ComprehensiveEnhancedOCR:
             )
 
     def _extract_with_tesseract_enhanced(self, pdf_bytes: bytes) -> ExtractionMethod:
-        """Enhanced Tesseract OCR with pdf2image and preprocessing"""
+        """Enhanced Tesseract OCR with page rasterization and preprocessing"""
         start_time = time.time()
         try:
-            # Convert PDF to images
-            images = convert_from_bytes(pdf_bytes, dpi=300, fmt='PNG')
-            
-            text_parts = []
+            text_buffer = io.StringIO()
             total_confidence = 0
             pages_processed = 0
             
-            for page_num, image in enumerate(images[:15]):  # Limit pages
-                # Preprocess image
-                processed_image = self._preprocess_image_advanced(image)
-                
-                # Try different Tesseract configurations
-                configs = ['academic', 'default', 'table']
-                best_page_text = ""
-                best_page_confidence = 0
-                
-                for config_name in configs:
-                    try:
-                        config = self.tesseract_configs[config_name]
-                        result = pytesseract.image_to_data(
-                            processed_image, 
-                            config=config,
-                            output_type=pytesseract.Output.DICT
-                        )
-                        
-                        # Filter and combine text
-                        page_text = " ".join([
-                            text for text, conf in zip(result['text'], result['conf'])
-                            if int(conf) > 30 and text.strip()
-                        ])
-                        
-                        page_confidence = np.mean([
-                            int(conf) for conf in result['conf'] if int(conf) > 0
-                        ]) / 100.0 if any(int(conf) > 0 for conf in result['conf']) else 0
-                        
-                        if page_confidence > best_page_confidence:
-                            best_page_text = page_text
-                            best_page_confidence = page_confidence
-                            
-                    except Exception as e:
-                        logger.warning(f"Tesseract config {config_name} failed: {e}")
-                        continue
+            with ExitStack() as stack:
+                if TESSEROCR_AVAILABLE:
+                    # One in-process engine per config, loaded once and reused
+                    # for every page; the engines aren't thread-safe, so pages
+                    # go through them one at a time
+                    tesserocr_apis = self._open_tesserocr_apis(stack)
+                    max_workers = 1
+                else:
+                    # Each pytesseract call runs the tesseract binary, so pages
+                    # can be OCR'd side by side from a few threads
+                    tesserocr_apis = None
+                    max_workers = OCR_PAGE_WORKERS
                 
-                if best_page_text.strip():
-                    text_parts.append(f"\n--- Page {page_num + 1} ---\n{best_page_text}")
-                    total_confidence += best_page_confidence
-                    pages_processed += 1
+                # Convert PDF to grayscale images one page at a time; MuPDF
+                # renders a third of the bytes and preprocessing skips cvtColor
+                page_images = self._iter_page_images(
+                    pdf_bytes, dpi=300, max_pages=15, grayscale=True,
+                    max_long_edge=TESSERACT_MAX_LONG_EDGE
+                )
+                page_results = self._map_pages(
+                    lambda image: self._ocr_page_best_config(image, tesserocr_apis),
+                    page_images,
+                    max_workers
+                )
+                for page_num, (best_page_text, best_page_confidence) in enumerate(page_results):
+                    if best_page_text.strip():
+                        text_buffer.write(f"\n--- Page {page_num + 1} ---\n")
+                        text_buffer.write(best_page_text)
+                        total_confidence += best_page_confidence
+                        pages_processed += 1
             
-            combined_text = "".join(text_parts)
+            combined_text = text_buffer.getvalue()
             overall_confidence = total_confidence / pages_processed if pages_processed > 0 else 0
             
             return ExtractionMethod(
                 name="tesseract_enhanced",
-                description="Tesseract OCR with pdf2image and preprocessing",
+                description="Tesseract OCR with PyMuPDF rasterization and preprocessing",
                 confidence=overall_confidence,
                 processing_time=time.time() - start_time,
                 text_length=len(combined_text),
-                success=len(combined_text.strip()) > 0
+                success=len(combined_text.strip()) > 0,
+                text=combined_text
             )
             
         except Exception as e:
             return ExtractionMethod(
                 name="tesseract_enhanced",
-                description="Tesseract OCR with pdf2image and preprocessing",
+                description="Tesseract OCR with PyMuPDF rasterization and preprocessing",
                 confidence=0.0,
                 processing_time=time.time() - start_time,
                 text_length=0,
@@ -678,6 +771,107 @@ class ComprehensiveEnhancedOCR:
                 error=str(e)
             )
 
+    def _ocr_page_best_config(self, image, tesserocr_apis: Optional[Dict[str, Any]]) -> Tuple[str, float]:
+        """Preprocess one page and OCR it with the page configs in turn until
+        one is confident enough, keeping the text of the most confident one"""
+        # Preprocess image
+        processed_image = self._preprocess_image_advanced(image)
+        
+        # Try different Tesseract configurations
+        best_page_text = ""
+        best_page_confidence = 0
+        
+        for config_name, config in self.PAGE_OCR_CONFIGS:
+            try:
+                texts, confs = self._tesseract_words(
+                    processed_image, config_name, config, tesserocr_apis
+                )
+                
+                # Whole-number confidences (as int() gave), -1 for non-words
+                conf_values = np.asarray(confs, dtype=np.float64).astype(np.int32)
+                
+                # Filter and combine text
+                keep = np.flatnonzero(conf_values > 30)
+                page_text = " ".join([texts[i] for i in keep if texts[i].strip()])
+                
+                positive = conf_values[conf_values > 0]
+                page_confidence = positive.mean() / 100.0 if positive.size else 0
+                
+                if page_confidence > best_page_confidence:
+                    best_page_text = page_text
+                    best_page_confidence = page_confidence
+                    
+            except Exception as e:
+                logger.warning(f"Tesseract config {config_name} failed: {e}")
+                continue
+            
+            if best_page_confidence >= self.GOOD_PAGE_CONFIDENCE:
+                break
+        
+        return best_page_text, best_page_confidence
+
+    def _map_pages(self, func, pages, max_workers: int):
+        """Yield ``func(page)`` for each page, in page order, running up to
+        ``max_workers`` pages at once
+        
+        Pages are pulled from the iterable only as workers free up, so a
+        streaming page generator never has more than a few pages in memory.
+        """
+        if max_workers <= 1:
+            for page in pages:
+                yield func(page)
+            return
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = deque()
+            for page in pages:
+                in_flight.append(executor.submit(func, page))
+                if len(in_flight) >= max_workers:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def _open_tesserocr_apis(self, stack: ExitStack) -> Dict[str, Any]:
+        """One tesserocr engine per page config, closed when ``stack`` exits"""
+        from tesserocr import PyTessBaseAPI, OEM
+        
+        return {
+            config_name: stack.enter_context(
+                PyTessBaseAPI(psm=psm, oem=OEM.DEFAULT, variables=variables)
+            )
+            for config_name, (psm, variables) in self.TESSEROCR_PAGE_SETTINGS.items()
+        }
+
+    def _tesseract_words(self, image, config_name: str, config: str,
+                         tesserocr_apis: Optional[Dict[str, Any]]) -> Tuple[List[str], List[float]]:
+        """Recognized words and their confidences (0-100) for one config"""
+        if not tesserocr_apis:
+            import pytesseract
+            
+            result = pytesseract.image_to_data(
+                image,
+                config=config,
+                output_type=pytesseract.Output.DICT
+            )
+            return result['text'], result['conf']
+        
+        from tesserocr import RIL, iterate_level
+        
+        api = tesserocr_apis[config_name]
+        img_array = np.ascontiguousarray(image)
+        height, width = img_array.shape[:2]
+        bytes_per_pixel = 1 if img_array.ndim == 2 else img_array.shape[2]
+        api.SetImageBytes(img_array.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+        api.Recognize()
+        
+        texts, confs = [], []
+        iterator = api.GetIterator()
+        if iterator is not None:
+            for word in iterate_level(iterator, RIL.WORD):
+                texts.append(word.GetUTF8Text(RIL.WORD) or "")
+                confs.append(word.Confidence(RIL.WORD))
+        return texts, confs
+
     def _extract_with_doctr(self, pdf_bytes: bytes) -> ExtractionMethod:
         """Extract using DocTR for advanced OCR"""
         start_time = time.time()
@@ -685,24 +879,30 @@ class ComprehensiveEnhancedOCR:
             if not self.doctr_model:
                 raise Exception("DocTR model not available")
             
-            # Convert PDF to images for DocTR
-            images = convert_from_bytes(pdf_bytes, dpi=200, fmt='RGB')
-            
-            text_parts = []
+            page_count = self._get_page_count(pdf_bytes)
+            text_buffer = io.StringIO()
             total_confidence = 0
             
-            for page_num, image in enumerate(images[:10]):  # Limit pages
-                # Convert PIL to numpy array
-                img_array = np.array(image)
-                
-                # Run DocTR
-                result = self.doctr_model([img_array])
+            # Convert PDF to images for DocTR and run the model on a few pages
+            # per forward pass
+            page_images = self._iter_page_images(
+                pdf_bytes, dpi=200, max_pages=10, max_long_edge=DOCTR_MAX_LONG_EDGE
+            )
+            page_num = 0
+            while True:
+                batch = list(islice(page_images, DOCTR_BATCH_SIZE))
+                if not batch:
+                    break
                 
-                # Extract text and confidence
-                page_text = ""
-                page_confidence_scores = []
+                # Run DocTR; result.pages lines up with the batch
+                result = self.doctr_model(batch)
+                del batch
                 
                 for page_result in result.pages:
+                    # Extract text and confidence
+                    page_text = ""
+                    page_confidence_scores = []
+                    
                     for block in page_result.blocks:
                         for line in block.lines:
                             line_text = ""
@@ -714,15 +914,17 @@ class ComprehensiveEnhancedOCR:
                             if line_text.strip():
                                 page_text += line_text + "\n"
                                 page_confidence_scores.extend(line_confidences)
-                
-                page_confidence = np.mean(page_confidence_scores) if page_confidence_scores else 0
-                
-                if page_text.strip():
-                    text_parts.append(f"\n--- Page {page_num + 1} ---\n{page_text}")
-                    total_confidence += page_confidence
+                    
+                    page_confidence = np.mean(page_confidence_scores) if page_confidence_scores else 0
+                    
+                    if page_text.strip():
+                        text_buffer.write(f"\n--- Page {page_num + 1} ---\n")
+                        text_buffer.write(page_text)
+                        total_confidence += page_confidence
+                    page_num += 1
             
-            combined_text = "".join(text_parts)
-            overall_confidence = total_confidence / len(images) if images else 0
+            combined_text = text_buffer.getvalue()
+            overall_confidence = total_confidence / page_count if page_count else 0
             
             return ExtractionMethod(
                 name="doctr",
@@ -730,7 +932,8 @@ class ComprehensiveEnhancedOCR:
                 confidence=overall_confidence,
                 processing_time=time.time() - start_time,
                 text_length=len(combined_text),
-                success=len(combined_text.strip()) > 0
+                success=len(combined_text.strip()) > 0,
+                text=combined_text
             )
             
         except Exception as e:
@@ -744,34 +947,65 @@ class ComprehensiveEnhancedOCR:
                 error=str(e)
             )
 
+    def _iter_page_images(self, pdf_bytes: bytes, dpi: int, max_pages: int, grayscale: bool = False,
+                          max_long_edge: Optional[int] = None):
+        """Rasterize the first ``max_pages`` pages, yielding one uint8 array at
+        a time: height x width x 3 (RGB), or height x width with ``grayscale``
+        
+        Pages are rendered in-process by PyMuPDF straight into the array's
+        buffer, and only the page being OCR'd is held in memory. With
+        ``max_long_edge``, large pages are rendered below ``dpi`` so their
+        longer side stays within that many pixels.
+        """
+        import fitz  # PyMuPDF
+        
+        colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        try:
+            mat = fitz.Matrix(dpi / 72, dpi / 72)
+            for page_num in range(min(len(doc), max_pages)):
+                page = doc[page_num]
+                page_mat = mat
+                if max_long_edge:
+                    # Page sizes are in points (1/72 inch)
+                    page_dpi = min(dpi, max_long_edge * 72 / max(page.rect.width, page.rect.height))
+                    page_mat = fitz.Matrix(page_dpi / 72, page_dpi / 72)
+                pix = page.get_pixmap(matrix=page_mat, colorspace=colorspace, alpha=False)
+                shape = (pix.height, pix.width) if pix.n == 1 else (pix.height, pix.width, pix.n)
+                image = np.frombuffer(pix.samples, dtype=np.uint8).reshape(shape)
+                pix = None
+                yield image
+        finally:
+            doc.close()
+
     def _extract_with_pymupdf_ocr(self, pdf_bytes: bytes) -> ExtractionMethod:
         """PyMuPDF OCR fallback method"""
+        import pytesseract
+        
         start_time = time.time()
         try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            text_parts = []
+            text_buffer = io.StringIO()
             
-            for page_num in range(min(len(doc), 10)):
-                page = doc[page_num]
-                
-                # Convert page to image and OCR
-                mat = fitz.Matrix(2.0, 2.0)
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("png")
-                pix = None
-                
-                # OCR with Tesseract
-                image = Image.open(io.BytesIO(img_data))
-                page_text = pytesseract.image_to_string(
-                    image, 
+            # Convert pages to images (2x zoom, i.e. 144 dpi) with the same
+            # rasterizer as the other OCR methods, straight to arrays rather
+            # than through a PNG encode/decode per page
+            page_images = self._iter_page_images(pdf_bytes, dpi=144, max_pages=10, grayscale=True)
+            
+            # OCR with Tesseract
+            page_texts = self._map_pages(
+                lambda image: pytesseract.image_to_string(
+                    image,
                     config=self.tesseract_configs['default']
-                )
-                
+                ),
+                page_images,
+                OCR_PAGE_WORKERS
+            )
+            for page_num, page_text in enumerate(page_texts):
                 if page_text.strip():
-                    text_parts.append(f"\n--- Page {page_num + 1} ---\n{page_text}")
+                    text_buffer.write(f"\n--- Page {page_num + 1} ---\n")
+                    text_buffer.write(page_text)
             
-            doc.close()
-            combined_text = "".join(text_parts)
+            combined_text = text_buffer.getvalue()
             confidence = self._calculate_text_quality(combined_text)
             
             return ExtractionMethod(
@@ -780,7 +1014,8 @@ class ComprehensiveEnhancedOCR:
                 confidence=confidence,
                 processing_time=time.time() - start_time,
                 text_length=len(combined_text),
-                success=len(combined_text.strip()) > 0
+                success=len(combined_text.strip()) > 0,
+                text=combined_text
             )
             
         except Exception as e:
@@ -794,86 +1029,81 @@ class ComprehensiveEnhancedOCR:
                 error=str(e)
             )
 
-    def _preprocess_image_advanced(self, image: Image.Image) -> Image.Image:
-        """Advanced image preprocessing for better OCR"""
+    def _preprocess_image_advanced(self, image: np.ndarray, denoise: str = 'auto') -> np.ndarray:
+        """Advanced image preprocessing for better OCR
+        
+        Works on a single uint8 array end to end; pytesseract accepts the
+        returned array directly, so the image never goes back through PIL.
+        
+        denoise: 'auto' uses a median blur and falls back to non-local means
+        only on noisy pages, 'heavy' always uses non-local means, 'off' skips it.
+        """
+        import cv2
+        
         try:
-            # Convert to grayscale
-            if image.mode != 'L':
-                image = image.convert('L')
-            
-            # Enhance contrast
-            enhancer = ImageEnhance.Contrast(image)
-            image = enhancer.enhance(1.5)
+            # Convert to grayscale (pages rendered in grayscale already are)
+            img_array = np.asarray(image)
+            if img_array.ndim == 3:
+                color_code = cv2.COLOR_RGBA2GRAY if img_array.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+                img_array = cv2.cvtColor(img_array, color_code)
             
-            # Enhance sharpness
-            enhancer = ImageEnhance.Sharpness(image)
-            image = enhancer.enhance(2.0)
-            
-            # Convert to OpenCV format
-            img_array = np.array(image)
+            # Enhance contrast and sharpness in one pass. Contrast(1.5) is
+            # 1.5 * image - 0.5 * mean and the sharpen kernel sums to 1, so
+            # both fold into 1.5 * _SHARPEN_KERNEL with a -0.5 * mean offset
+            mean = float(img_array.mean())
+            img_array = cv2.filter2D(img_array, -1, _CONTRAST_SHARPEN_KERNEL, delta=-0.5 * mean)
             
             # Noise reduction
-            img_denoised = cv2.fastNlMeansDenoising(img_array)
+            if denoise != 'off':
+                img_median = cv2.medianBlur(img_array, 3)
+                if denoise == 'heavy' or (
+                    denoise == 'auto'
+                    and np.median(cv2.absdiff(img_array, img_median)) > NOISY_PAGE_THRESHOLD
+                ):
+                    img_array = cv2.fastNlMeansDenoising(img_array)
+                else:
+                    img_array = img_median
             
-            # Adaptive thresholding
+            # Adaptive thresholding. (A 1x1 morphological close used to follow;
+            # with a single-pixel kernel it returned the image unchanged.)
             img_thresh = cv2.adaptiveThreshold(
-                img_denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                img_array, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
                 cv2.THRESH_BINARY, 11, 2
             )
             
-            # Morphological operations to clean up
-            kernel = np.ones((1, 1), np.uint8)
-            img_cleaned = cv2.morphologyEx(img_thresh, cv2.MORPH_CLOSE, kernel)
-            
-            return Image.fromarray(img_cleaned)
+            return img_thresh
             
         except Exception as e:
             logger.warning(f"Advanced preprocessing failed: {e}")
             return image
 
-    def _process_pymupdf_blocks(self, blocks_dict: Dict) -> str:
+    def _process_pymupdf_blocks(self, blocks: List[Tuple]) -> str:
         """Process PyMuPDF blocks to preserve layout"""
-        text_parts = []
-        
-        for block in blocks_dict.get('blocks', []):
-            if 'lines' in block:
-                block_text = []
-                for line in block['lines']:
-                    line_text = ""
-                    for span in line.get('spans', []):
-                        line_text += span.get('text', '')
-                    if line_text.strip():
-                        block_text.append(line_text)
-                
-                if block_text:
-                    text_parts.append('\n'.join(block_text))
-        
-        return '\n\n'.join(text_parts)
+        # (x0, y0, x1, y1, text, block_no, block_type); type 0 is text, 1 is image
+        return '\n\n'.join(
+            text for text in (block[4].strip() for block in blocks if block[6] == 0) if text
+        )
 
     def _table_to_text(self, table: List[List[str]]) -> str:
         """Convert table data to readable text format"""
         if not table:
             return ""
         
+        # Stringify every cell once; rows may have different lengths
+        rows = [[str(cell) if cell else "" for cell in row] for row in table]
+        
+        # Very large tables aren't worth aligning
+        if len(rows) > TABLE_ALIGN_MAX_ROWS:
+            return "\n".join(" | ".join(row) for row in rows)
+        
         # Calculate column widths
-        max_widths = []
-        for row in table:
-            for i, cell in enumerate(row):
-                cell_text = str(cell) if cell else ""
-                if i >= len(max_widths):
-                    max_widths.append(len(cell_text))
-                else:
-                    max_widths[i] = max(max_widths[i], len(cell_text))
+        max_widths = [max(map(len, column)) for column in zip_longest(*rows, fillvalue="")]
         
         # Format table
-        formatted_rows = []
-        for row in table:
-            formatted_cells = []
-            for i, cell in enumerate(row):
-                cell_text = str(cell) if cell else ""
-                width = max_widths[i] if i < len(max_widths) else 10
-                formatted_cells.append(cell_text.ljust(width))
-            formatted_rows.append(" | ".join(formatted_cells))
+        formatted_rows = [
+            " | ".join(cell.ljust(width) for cell, width in zip(row, max_widths))
+            for row in rows
+        ]
         
         return "\n".join(formatted_rows)
 
@@ -883,32 +1113,29 @@ class ComprehensiveEnhancedOCR:
             return 0.0
         
         score = 0.0
-        text_lower = text.lower()
-        
-        # Check for academic patterns
-        pattern_scores = {}
-        for pattern_name, pattern in self.academic_patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            pattern_scores[pattern_name] = len(matches)
-            score += min(len(matches) * 0.05, 0.2)  # Max 0.2 per pattern
-        
-        # Text structure quality
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        if len(lines) > 10:
+        
+        # Check for academic patterns. Each pattern is worth at most 0.2
+        # (4 matches), so stop scanning once that's reached
+        for compiled in self._academic_res.values():
+            match_count = sum(1 for _ in islice(compiled.finditer(text), 4))
+            score += min(match_count * 0.05, 0.2)  # Max 0.2 per pattern
+        
+        # Text structure quality: more than 10 non-blank lines
+        if sum(1 for _ in islice(NON_BLANK_LINE_RE.finditer(text), 11)) > 10:
             score += 0.1
         
-        # Word diversity
-        words = re.findall(r'\b\w+\b', text_lower)
-        unique_words = set(words)
-        if len(words) > 0:
-            diversity = len(unique_words) / len(words)
+        # Word diversity, counted case-insensitively in one pass over the
+        # words without keeping a list of them
+        word_counts = Counter(match.group().lower() for match in WORD_RE.finditer(text))
+        word_total = sum(word_counts.values())
+        if word_total > 0:
+            diversity = len(word_counts) / word_total
             score += min(diversity, 0.3)
         
         # Penalize too much repetition
-        if len(words) > 100:
-            word_counts = Counter(words)
-            most_common_count = word_counts.most_common(1)[0][1] if word_counts else 0
-            repetition_ratio = most_common_count / len(words)
+        if word_total > 100:
+            most_common_count = max(word_counts.values(), default=0)
+            repetition_ratio = most_common_count / word_total
             if repetition_ratio > 0.1:  # More than 10% repetition
                 score *= (1 - repetition_ratio)
         
@@ -925,9 +1152,10 @@ class ComprehensiveEnhancedOCR:
             'academic_terms': []
         }
         
-        for pattern_name, pattern in self.academic_patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        # Only the patterns with a slot above are scanned
+        for pattern_name, compiled in self._academic_res.items():
             if pattern_name in structured:
+                matches = compiled.findall(text)
                 if isinstance(structured[pattern_name], list):
                     structured[pattern_name] = list(set(matches))  # Remove duplicates
                 else:
@@ -935,37 +1163,34 @@ class ComprehensiveEnhancedOCR:
         
         return structured
 
-    def _get_method_text(self, pdf_bytes: bytes, method_name: str, is_ocr: bool = False) -> str:
+    def _get_method_text(self, pdf_bytes: bytes, method_name: str, is_ocr: bool = False,
+                         methods_tried: Optional[List[ExtractionMethod]] = None) -> str:
         """Get actual text using the specified method"""
+        import fitz  # PyMuPDF
+        import pdfplumber
+        
+        # Reuse the text the method already extracted
+        for method in methods_tried or []:
+            if method.name == method_name and method.text:
+                return method.text
+        
         # This is a simplified implementation
         # In practice, you'd call the specific extraction method
         try:
-            if "pymupdf" in method_name and not is_ocr:
-                doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-                text = ""
-                for page in doc:
-                    text += page.get_text() + "\n"
-                doc.close()
-                return text
-            elif "pdfplumber" in method_name:
+            if "pdfplumber" in method_name:
                 with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                    text = ""
-                    for page in pdf.pages:
-                        text += (page.extract_text() or "") + "\n"
-                    return text
+                    return "\n".join(page.extract_text() or "" for page in pdf.pages)
             else:
-                # Fallback to simple extraction
-                doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-                text = ""
-                for page in doc:
-                    text += page.get_text() + "\n"
-                doc.close()
-                return text
+                # PyMuPDF, also the fallback for every other method
+                with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+                    return "\n".join(page.get_text() for page in doc)
         except:
             return ""
 
     def _get_page_count(self, pdf_bytes: bytes) -> int:
         """Get page count from PDF"""
+        import fitz  # PyMuPDF
+        
         try:
             doc = fitz.open(stream=pdf_bytes, filetype="pdf")
             count = len(doc)
@@ -15,6 +15,7 @@ import logging
 from typing import Dict, List, Optional, Tuple, Any
 import time
 import re
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +36,19 @@ class ComprehensiveOCRService:
         'first_page': 1,
         'last_page': 15,  # Limit pages for performance
     }
+    
+    # A run of letters, as a sign that extracted text is real content
+    LETTERS_RE = re.compile(r'[a-zA-Z]{3,}')
+    
+    # File signatures (magic bytes) keyed by their first two bytes
+    FILE_SIGNATURES = {
+        b'%P': (b'%PDF', 'pdf'),
+        b'\xff\xd8': (b'\xff\xd8', 'jpeg'),
+        b'\x89P': (b'\x89PNG\r\n\x1a\n', 'png'),
+        b'II': (b'II', 'tiff'),
+        b'MM': (b'MM', 'tiff'),
+        b'BM': (b'BM', 'bmp'),
+    }
 
     @classmethod
     def process_document(cls, file_bytes: bytes, filename: str, options: Optional[Dict] = None) -> Dict[str, Any]:
@@ -259,11 +273,9 @@ class ComprehensiveOCRService:
         Preprocess image to improve OCR accuracy
         """
         try:
-            # Convert PIL image to OpenCV format
-            opencv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-            
-            # Convert to grayscale
-            gray = cv2.cvtColor(opencv_image, cv2.COLOR_BGR2GRAY)
+            # Convert to grayscale straight from the RGB(A) pixels, without an
+            # intermediate BGR copy
+            gray = cls._to_grayscale(image)
             
             # Noise removal
             denoised = cv2.fastNlMeansDenoising(gray)
@@ -283,23 +295,32 @@ class ComprehensiveOCRService:
         except Exception as e:
             logger.warning(f"Image preprocessing failed: {str(e)}, using original")
             # Return original image as numpy array if preprocessing fails
-            return np.array(image.convert('L'))  # Convert to grayscale
+            if isinstance(image, np.ndarray):
+                return image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            return np.asarray(image.convert('L'))  # Convert to grayscale
+
+    @classmethod
+    def _to_grayscale(cls, image: Image.Image) -> np.ndarray:
+        """Grayscale uint8 array of a PIL image"""
+        if image.mode == 'L':
+            return np.asarray(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            # Palette, CMYK, 16-bit etc. are left to PIL
+            return np.asarray(image.convert('L'))
+        
+        color_code = cv2.COLOR_RGBA2GRAY if image.mode == 'RGBA' else cv2.COLOR_RGB2GRAY
+        return cv2.cvtColor(np.asarray(image), color_code)
 
     @classmethod
     def _detect_file_type(cls, file_bytes: bytes, filename: str) -> str:
         """Detect file type from bytes and filename"""
         
         # Check file signature (magic bytes)
-        if file_bytes[:4] == b'%PDF':
-            return 'pdf'
-        elif file_bytes[:2] == b'\xff\xd8':  # JPEG
-            return 'jpeg'
-        elif file_bytes[:8] == b'\x89PNG\r\n\x1a\n':  # PNG
-            return 'png'
-        elif file_bytes[:2] in [b'II', b'MM']:  # TIFF
-            return 'tiff'
-        elif file_bytes[:2] == b'BM':  # BMP
-            return 'bmp'
+        signature = cls.FILE_SIGNATURES.get(file_bytes[:2])
+        if signature is not None:
+            magic, file_type = signature
+            if file_bytes.startswith(magic):
+                return file_type
         
         # Fallback to filename extension
         ext = filename.lower().split('.')[-1] if '.' in filename else ''
@@ -317,45 +338,80 @@ class ComprehensiveOCRService:
         if not text or len(text.strip()) < 50:
             return False
         
-        clean_text = re.sub(r'\s+', ' ', text).strip()
-        word_count = len(clean_text.split())
+        # Length of the text with whitespace runs collapsed to single spaces,
+        # without building that string
+        words = text.split()
+        word_count = len(words)
+        clean_length = sum(map(len, words)) + word_count - 1
         
-        # Check for reasonable content
-        has_letters = bool(re.search(r'[a-zA-Z]{3,}', clean_text))
-        has_reasonable_length = len(clean_text) > 100
+        # Check for reasonable content, cheapest checks first
         has_enough_words = word_count > 20
+        has_reasonable_length = clean_length > 100
         
-        return has_letters and has_reasonable_length and has_enough_words
+        return has_enough_words and has_reasonable_length and cls.LETTERS_RE.search(text) is not None
 
 # Utility functions for transcript processing
 class TranscriptAnalyzer:
     """Analyze transcript content for student verification"""
     
+    # Name patterns to look for
+    NAME_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in (
+        # CUEA specific pattern - name above student number (primary pattern)
+        r'([A-Z]+\s+[A-Z]+\s+[A-Z]+)\s*\n\s*\d{6,8}',
+        # Look for names before student ID numbers
+        r'([A-Z][A-Z\s]+[A-Z])\s*\n\s*(\d{7,})',  # Name above student ID
+        # Pattern for "EASTON MICHURA OCHIENG" type names
+        r'\b([A-Z]{3,}\s+[A-Z]{3,}\s+[A-Z]{3,})\b',
+        # Look for names in transcript headers
+        r'([A-Z][A-Z\s]+[A-Z])\s*(?:ID|STUDENT|REG|ADMISSION)',  # Uppercase names
+        # Standard name field patterns
+        r'(?:student\s+name|name\s+of\s+student|full\s+name)[:\s]*([^\n\r]{5,50})',
+        r'(?:name)[:\s]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})',
+    ))
+    
+    # Unit patterns, run over the whole text; [^\S\n] (whitespace other than
+    # a newline) and '.' keep every match within a single line
+    UNIT_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'(?:credit[^\S\n]*(?:hours?|units?)?[^\S\n]*:?[^\S\n]*(\d+))[^\S\n]*.*?'
+        r'(?:grade[^\S\n]*:?[^\S\n]*([A-F][+-]?|[IXZ]))',
+        r'([A-Z]{2,4}[^\S\n]*\d{3,4})[^\S\n]+.*?(\d+)[^\S\n]*(?:units?|credits?|hrs?)[^\S\n]*.*?([A-F][+-]?|[IXZ])',
+        r'([A-F][+-]?|[IXZ])[^\S\n]*.*?(\d+)[^\S\n]*(?:units?|credits?)',
+    ))
+    
+    # Summary lines; the lazy ^[^\n]*? prefix finds only the first summary
+    # figure on each line, as a per-line search would
+    SUMMARY_PATTERNS = (
+        re.compile(
+            r'^[^\n]*?(?:total|completed|earned)[^\S\n]*(?:units?|credits?|hours?)(?::|[^\S\n])*(\d+)',
+            re.IGNORECASE | re.MULTILINE
+        ),
+    )
+    
+    # Academic/system words that never appear in a student's name
+    EXCLUDED_NAME_WORDS = frozenset({
+        'UNIT', 'CODE', 'DESCRIPTION', 'GRADE', 'CREDIT', 'OBJECT', 'ORIENTED',
+        'PROGRAMMING', 'COMPUTER', 'SCIENCE', 'BACHELOR', 'EASTERN', 'AFRICA',
+        'CATHOLIC', 'UNIVERSITY', 'ACADEMIC', 'REGISTRAR', 'TRANSCRIPT',
+        'STUDENT', 'NUMBER', 'STAGE', 'SEMESTER', 'YEAR', 'MARKS', 'POINTS'
+    })
+    
+    PUNCTUATION_RE = re.compile(r'[^\w\s]')
+    
+    # The unit patterns only capture [A-F][+-]? or [IXZ] grades, so the
+    # first letter is enough to classify one
+    LETTER_GRADES = frozenset('ABCDEF')
+    INCOMPLETE_GRADES = frozenset('IXZ')
+    
     @classmethod
     def extract_student_name(cls, text: str, filename: str = '') -> str:
         """Extract student name from transcript text"""
         
-        # Name patterns to look for
-        name_patterns = [
-            # CUEA specific pattern - name above student number (primary pattern)
-            r'([A-Z]+\s+[A-Z]+\s+[A-Z]+)\s*\n\s*\d{6,8}',
-            # Look for names before student ID numbers
-            r'([A-Z][A-Z\s]+[A-Z])\s*\n\s*(\d{7,})',  # Name above student ID
-            # Pattern for "EASTON MICHURA OCHIENG" type names
-            r'\b([A-Z]{3,}\s+[A-Z]{3,}\s+[A-Z]{3,})\b',
-            # Look for names in transcript headers
-            r'([A-Z][A-Z\s]+[A-Z])\s*(?:ID|STUDENT|REG|ADMISSION)',  # Uppercase names
-            # Standard name field patterns
-            r'(?:student\s+name|name\s+of\s+student|full\s+name)[:\s]*([^\n\r]{5,50})',
-            r'(?:name)[:\s]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})',
-        ]
-        
-        for pattern in name_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
+        for pattern in cls.NAME_PATTERNS:
+            for match in pattern.finditer(text):
                 candidate_name = match.group(1).strip()
                 if cls._is_valid_name(candidate_name):
-                    return cls._clean_name(candidate_name)
+                    # Valid names are alphabetic words, nothing to strip
+                    return candidate_name.title()
         
         # Fallback to filename extraction
         return cls._extract_name_from_filename(filename)
@@ -368,68 +424,47 @@ class TranscriptAnalyzer:
         has_incomplete_units = False
         unit_details = []
         
-        # Unit patterns
-        unit_patterns = [
-            r'(?:credit\s*(?:hours?|units?)?\s*:?\s*(\d+))\s*.*?(?:grade\s*:?\s*([A-F][+-]?|[IXZ]))',
-            r'([A-Z]{2,4}\s*\d{3,4})\s+.*?(\d+)\s*(?:units?|credits?|hrs?)\s*.*?([A-F][+-]?|[IXZ])',
-            r'([A-F][+-]?|[IXZ])\s*.*?(\d+)\s*(?:units?|credits?)',
-        ]
-        
-        lines = text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            for pattern in unit_patterns:
-                matches = re.finditer(pattern, line, re.IGNORECASE)
+        for pattern in cls.UNIT_PATTERNS:
+            for match in pattern.finditer(text):
+                groups = match.groups()
                 
-                for match in matches:
-                    groups = match.groups()
-                    
-                    # Extract units and grade based on pattern
-                    if len(groups) >= 2:
-                        try:
-                            if groups[0].isdigit():  # First group is units
-                                units = int(groups[0])
-                                grade = groups[1].upper()
-                            elif groups[1].isdigit():  # Second group is units
-                                units = int(groups[1])
-                                grade = groups[2].upper() if len(groups) > 2 else groups[0].upper()
-                            else:
-                                continue
-                            
-                            if units <= 0 or units > 10:
-                                continue
-                            
-                            unit_details.append({
-                                'course': groups[0] if not groups[0].isdigit() else 'Course',
-                                'units': units,
-                                'grade': grade
-                            })
-                            
-                            # Count completed units
-                            if re.match(r'^[A-F][+-]?$', grade) and grade != 'F':
-                                completed_units += units
-                            elif re.match(r'^[IXZ]$', grade):
-                                has_incomplete_units = True
-                                
-                        except (ValueError, IndexError):
+                # Extract units and grade based on pattern
+                if len(groups) >= 2:
+                    try:
+                        first_is_units = groups[0].isdigit()
+                        if first_is_units:  # First group is units
+                            units = int(groups[0])
+                            grade = groups[1].upper()
+                        elif groups[1].isdigit():  # Second group is units
+                            units = int(groups[1])
+                            grade = groups[2].upper() if len(groups) > 2 else groups[0].upper()
+                        else:
+                            continue
+                        
+                        if units <= 0 or units > 10:
                             continue
+                        
+                        unit_details.append({
+                            'course': groups[0] if not first_is_units else 'Course',
+                            'units': units,
+                            'grade': grade
+                        })
+                        
+                        # Count completed units
+                        if grade[0] in cls.LETTER_GRADES and grade != 'F':
+                            completed_units += units
+                        elif grade in cls.INCOMPLETE_GRADES:
+                            has_incomplete_units = True
+                            
+                    except (ValueError, IndexError):
+                        continue
         
         # Look for summary lines
-        summary_patterns = [
-            r'(?:total|completed|earned)\s*(?:units?|credits?|hours?)[:\s]*(\d+)',
-        ]
-        
-        for line in lines:
-            for pattern in summary_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
-                if match:
-                    summary_units = int(match.group(1))
-                    if 10 <= summary_units <= 200:  # Reasonable range
-                        completed_units = max(completed_units, summary_units)
+        for pattern in cls.SUMMARY_PATTERNS:
+            for match in pattern.finditer(text):
+                summary_units = int(match.group(1))
+                if 10 <= summary_units <= 200:  # Reasonable range
+                    completed_units = max(completed_units, summary_units)
         
         return {
             'completed_units': completed_units,
@@ -437,9 +472,11 @@ class TranscriptAnalyzer:
             'unit_details': unit_details
         }
     
-    @classmethod
-    def _is_valid_name(cls, candidate: str) -> bool:
-        """Check if candidate string looks like a valid name"""
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _is_valid_name(candidate: str) -> bool:
+        """Check if candidate string looks like a valid name (cached: the same
+        candidates come up across name patterns)"""
         
         if not candidate or len(candidate) < 5 or len(candidate) > 50:
             return False
@@ -449,14 +486,7 @@ class TranscriptAnalyzer:
             return False
         
         # Check for academic/system words to exclude
-        exclude_words = {
-            'UNIT', 'CODE', 'DESCRIPTION', 'GRADE', 'CREDIT', 'OBJECT', 'ORIENTED',
-            'PROGRAMMING', 'COMPUTER', 'SCIENCE', 'BACHELOR', 'EASTERN', 'AFRICA',
-            'CATHOLIC', 'UNIVERSITY', 'ACADEMIC', 'REGISTRAR', 'TRANSCRIPT',
-            'STUDENT', 'NUMBER', 'STAGE', 'SEMESTER', 'YEAR', 'MARKS', 'POINTS'
-        }
-        
-        if any(word.upper() in exclude_words for word in words):
+        if any(word.upper() in TranscriptAnalyzer.EXCLUDED_NAME_WORDS for word in words):
             return False
         
         # Accept both title case (Easton) and uppercase (EASTON) names
@@ -469,7 +499,7 @@ class TranscriptAnalyzer:
     @classmethod
     def _clean_name(cls, name: str) -> str:
         """Clean and format name"""
-        return re.sub(r'[^\w\s]', '', name).strip().title()
+        return cls.PUNCTUATION_RE.sub('', name).strip().title()
     
     @classmethod
     def _extract_name_from_filename(cls, filename: str) -> str:
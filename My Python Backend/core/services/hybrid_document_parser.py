@@ -4,11 +4,15 @@ Uses intelligent text analysis and pattern matching to extract academic data
 """
 
 import re
+import copy
 import logging
+import hashlib
+import threading
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 import time
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, OrderedDict
+from functools import lru_cache
 
 try:
     from .comprehensive_enhanced_ocr import ComprehensiveEnhancedOCR
@@ -23,6 +27,136 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Extraction patterns, compiled once at import instead of on every call
+_NAME_PATTERNS = tuple(re.compile(pattern, re.MULTILINE) for pattern in (
+    # Pattern for "EASTON MICHURA OCHIENG" followed by student number
+    r'([A-Z]+\s+[A-Z]+\s+[A-Z]+)\s*\n\s*\d{6,8}',
+    # Pattern for name before Stage/Student No
+    r'([A-Z]{2,}\s+[A-Z]{2,}\s+[A-Z]{2,})\s*(?:Stage|Student\s*No|ID)',
+    # Pattern for "Name:" field
+    r'Name:\s*([A-Z]{2,}\s+[A-Z]{2,}\s+[A-Z]{2,})',
+    # Pattern matching the specific format from CUEA transcripts
+    r'([A-Z][A-Z\s]+[A-Z])\s*\n\s*(\d{7,})',
+    # Additional fallback patterns
+    r'Name:\s*([A-Z][A-Z\s]{10,50})',
+))
+
+_STUDENT_ID_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'Student\s*No:\s*(\d{6,8})',
+    r'ID:\s*(\d{6,8})',
+    r'(\d{7})',  # Specific to the 1046098 format seen
+))
+
+# Each pattern with the lowercase words it can't match without; a pattern
+# is skipped when none of them is in the text, saving a case-insensitive
+# scan (which re can't speed up with a literal prefix search)
+_PROGRAM_PATTERNS = tuple((anchors, re.compile(pattern, re.IGNORECASE)) for anchors, pattern in (
+    # Specific pattern for "Bachelor of Science in Computer Science"
+    (('bachelor',), r'(Bachelor\s+of\s+Science\s+in\s+Computer\s+Science)'),
+    # Program field patterns
+    (('program',), r'Programme?:\s*([^\n\r]{10,80})'),
+    (('program:',), r'Program:\s*([^\n\r]{10,80})'),
+    (('course:',), r'Course:\s*([^\n\r]{10,80})'),
+    # General Bachelor patterns
+    (('bachelor',), r'(Bachelor\s+of\s+Science\s+in\s+[A-Za-z\s]+)'),
+    (('bachelor',), r'(Bachelor\s+of\s+Arts\s+in\s+[A-Za-z\s]+)'),
+    (('bachelor',), r'(Bachelor\s+of\s+[A-Za-z\s]+)'),
+    # Diploma patterns
+    (('diploma',), r'(Diploma\s+in\s+[A-Za-z\s]+)'),
+    # Look for program names in context
+    (('studying', 'pursuing', 'enrolled'), r'(?:studying|pursuing|enrolled\s+in)\s+([A-Za-z\s]{10,50})'),
+))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Every run of three whole alphabetic words on one line, overlapping runs
+# included (the lookahead matches at each word start)
+_WORD_TRIPLE_RE = re.compile(
+    r'(?=(?<!\S)([^\W\d_]{2,}[^\S\n]+[^\W\d_]{2,}[^\S\n]+[^\W\d_]{2,})(?!\S))'
+)
+
+# Results of recent parses keyed by a hash of the PDF, so a re-uploaded
+# document isn't OCR'd again. Parsers are built per request, so the caches
+# live at module level. Only parses that found something are kept, so a
+# failed OCR run is retried on the next upload
+RESULT_CACHE_SIZE = 32
+_transcript_results: OrderedDict = OrderedDict()
+_fee_statement_results: OrderedDict = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _document_key(pdf_bytes: bytes) -> bytes:
+    return hashlib.blake2b(pdf_bytes, digest_size=16).digest()
+
+
+def _get_cached_result(cache: OrderedDict, key: bytes):
+    with _result_cache_lock:
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+        return result
+
+
+def _cache_result(cache: OrderedDict, key: bytes, result) -> None:
+    with _result_cache_lock:
+        cache[key] = result
+        cache.move_to_end(key)
+        if len(cache) > RESULT_CACHE_SIZE:
+            cache.popitem(last=False)
+
+def _first_lines(text: str, count: int) -> str:
+    """The first ``count`` lines of text, found without splitting all of it"""
+    end = -1
+    for _ in range(count):
+        end = text.find('\n', end + 1)
+        if end < 0:
+            return text
+    return text[:end]
+
+
+def _count_completed(courses: List[Any]) -> int:
+    """Number of completed courses, whether CleanedUnit or fallback dicts"""
+    if CleanedUnit is not None:
+        return sum(1 for course in courses if course.status == 'complete')
+    return sum(1 for course in courses if course.get('status') == 'complete')
+
+# Academic/header words that never appear in a student's name
+_EXCLUDED_NAME_WORDS = frozenset({
+    'UNIT', 'CODE', 'DESCRIPTION', 'GRADE', 'CREDIT', 'OBJECT', 'ORIENTED',
+    'PROGRAMMING', 'COMPUTER', 'SCIENCE', 'BACHELOR', 'EASTERN', 'AFRICA',
+    'CATHOLIC', 'UNIVERSITY', 'ACADEMIC', 'REGISTRAR', 'TRANSCRIPT',
+    'STUDENT', 'NUMBER', 'STAGE', 'SEMESTER', 'YEAR', 'MARKS', 'POINTS',
+    'TOTAL', 'AVERAGE', 'COURSE', 'DEPARTMENT', 'FACULTY'
+})
+
+# Academic period formats in one alternation; the group that closes last
+# (match.lastgroup) says which one matched. Y4S2 is case-sensitive
+_PERIOD_RE = re.compile(
+    r'(?-i:Y(?P<code_year>\d+)S(?P<code_semester>\d+))'
+    r'|Stage\s*(?P<stage_year>\d+)\s*Semester\s*(?P<stage_semester>\d+)'
+    r'|Year\s*(?P<year>\d+)'
+    r'|(?:Stage|Y)\s*(?P<any_year>\d+)'
+    r'|Semester\s*(?P<semester>\d+)'
+    r'|(?:Sem|S)\s*(?P<any_semester>\d+)',
+    re.IGNORECASE
+)
+
+# A full course row on one line (CMT 108 INTRO. TO WEB DEVELOPMENT 24 50 74 A 3),
+# or else a bare course code
+_COURSE_RE = re.compile(
+    r'(?P<row_code>[A-Z]{2,4}[ \t]+\d{3,4})[ \t]+(?P<title>[A-Z][A-Z \t\.\&/]{5,80})'
+    r'[ \t]+\d+[ \t]+\d+[ \t]+\d+[ \t]+(?P<grade>[A-F][+-]?)[ \t]+\d+'
+    r'|(?P<code>\b[A-Z]{2,4}\s*\d{3,4}[A-Z]?\b)'
+)
+
+# Fee statement balances; the statement patterns run on lowercased text
+_BALANCE_NUMBER_RE = re.compile(r'\d{1,6}\.?\d{0,2}')
+_BALANCE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'outstanding\s+balance[:\s]*([+-]?[\d,]+\.?\d*|\-)',
+    r'balance[:\s]*([+-]?[\d,]+\.?\d*|\-)',
+    r'total[:\s]*([+-]?[\d,]+\.?\d*|\-)',
+))
+
 @dataclass
 class HybridExtractionResult:
     """Result from hybrid parsing with confidence scoring"""
@@ -79,43 +213,54 @@ class HybridDocumentParser:
         """
         start_time = time.time()
         
+        # Same document as a recent upload: reuse its result
+        cache_key = _document_key(pdf_bytes)
+        cached = _get_cached_result(_transcript_results, cache_key)
+        if cached is not None:
+            logger.info("Hybrid parser reusing the result for an identical transcript")
+            return copy.deepcopy(cached)
+        
         # Get comprehensive OCR results
         ocr_result = self.ocr_processor.process_document_comprehensive(pdf_bytes)
         
-        # Extract text from all attempted methods for comparison
-        all_texts = []
-        all_texts.append(ocr_result.text)  # Primary result
-        
-        # Add texts from other methods that were tried
-        for method_result in ocr_result.methods_tried:
-            if method_result.success and method_result.text_length > 100:
-                all_texts.append(method_result.text)
-        
-        logger.info(f"Hybrid parser analyzing {len(all_texts)} text extractions")
-        
-        # Analyze each text extraction
+        # Analyze each text extraction. The primary text is normally the
+        # chosen method's text again, and methods can agree exactly; identical
+        # texts give identical candidates, so each is analyzed once. Courses
+        # from every text are combined as they come in
         extraction_candidates = []
-        for i, text in enumerate(all_texts):
+        all_courses = []
+        found_codes = set()
+        seen_texts = set()
+        for i, text in enumerate(self._iter_texts(ocr_result, min_length=100)):
+            if text in seen_texts:
+                continue
+            seen_texts.add(text)
+            
             candidate = self._analyze_text_extraction(text, f"method_{i}")
             if candidate:
                 extraction_candidates.append(candidate)
+                self._merge_courses(all_courses, found_codes, candidate.courses)
+        
+        logger.info(f"Hybrid parser analyzed {len(seen_texts)} distinct text extractions")
         
         # Select best extraction using confidence scoring
         best_extraction = self._select_best_extraction(extraction_candidates)
         
-        # Additional course detection across all texts
-        all_courses = self._comprehensive_course_detection(all_texts)
-        
         # Use the best courses found
         if len(all_courses) > len(best_extraction.courses):
             best_extraction.courses = all_courses
             best_extraction.total_courses = len(all_courses)
-            best_extraction.completed_courses = len([c for c in all_courses if (hasattr(c, 'status') and c.status == 'complete') or (isinstance(c, dict) and c.get('status') == 'complete')])
+            best_extraction.completed_courses = _count_completed(all_courses)
         
         processing_time = time.time() - start_time
         logger.info(f"Hybrid parsing complete in {processing_time:.2f}s: "
                    f"{len(best_extraction.courses)} courses found")
         
+        if best_extraction.courses or best_extraction.student_name != "Unknown Student":
+            # Callers get a deep copy, so neither the result nor its courses
+            # can be modified through the cache
+            _cache_result(_transcript_results, cache_key, best_extraction)
+            return copy.deepcopy(best_extraction)
         return best_extraction
 
     def _analyze_text_extraction(self, text: str, method_name: str) -> Optional[HybridExtractionResult]:
@@ -151,7 +296,7 @@ class HybridDocumentParser:
                 semester=semester,
                 courses=courses,
                 total_courses=len(courses),
-                completed_courses=len([c for c in courses if (hasattr(c, 'status') and c.status == 'complete') or (isinstance(c, dict) and c.get('status') == 'complete')]),
+                completed_courses=_count_completed(courses),
                 gpa=None,  # TODO: Implement GPA extraction
                 confidence=confidence,
                 extraction_method=method_name,
@@ -167,48 +312,26 @@ class HybridDocumentParser:
         Extract student name using multiple approaches
         """
         # Look for the specific format from user's documents
-        patterns = [
-            # Pattern for "EASTON MICHURA OCHIENG" followed by student number
-            r'([A-Z]+\s+[A-Z]+\s+[A-Z]+)\s*\n\s*\d{6,8}',
-            # Pattern for name before Stage/Student No
-            r'([A-Z]{2,}\s+[A-Z]{2,}\s+[A-Z]{2,})\s*(?:Stage|Student\s*No|ID)',
-            # Pattern for "Name:" field
-            r'Name:\s*([A-Z]{2,}\s+[A-Z]{2,}\s+[A-Z]{2,})',
-            # Pattern matching the specific format from CUEA transcripts
-            r'([A-Z][A-Z\s]+[A-Z])\s*\n\s*(\d{7,})',
-            # Additional fallback patterns
-            r'Name:\s*([A-Z][A-Z\s]{10,50})',
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, text, re.MULTILINE)
-            for match in matches:
+        for pattern in _NAME_PATTERNS:
+            for match in pattern.finditer(text):
                 name = match.group(1).strip()
                 # Clean and validate
                 if self._is_valid_name_hybrid(name):
                     return self._clean_name_hybrid(name)
         
         # Fallback: Look for three consecutive capitalized words
-        lines = text.split('\n')
-        for line in lines[:30]:  # Check first 30 lines
-            words = line.split()
-            for i in range(len(words) - 2):
-                candidate = ' '.join(words[i:i+3])
-                if self._is_valid_name_hybrid(candidate):
-                    return self._clean_name_hybrid(candidate)
+        head = _first_lines(text, 30)  # Check first 30 lines
+        for match in _WORD_TRIPLE_RE.finditer(head):
+            candidate = match.group(1)
+            if self._is_valid_name_hybrid(candidate):
+                return self._clean_name_hybrid(candidate)
         
         return "Unknown Student"
 
     def _extract_student_id_hybrid(self, text: str) -> str:
         """Extract student ID with multiple patterns"""
-        patterns = [
-            r'Student\s*No:\s*(\d{6,8})',
-            r'ID:\s*(\d{6,8})',
-            r'(\d{7})',  # Specific to the 1046098 format seen
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in _STUDENT_ID_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         
@@ -216,29 +339,15 @@ class HybridDocumentParser:
 
     def _extract_program_hybrid(self, text: str) -> str:
         """Extract academic program"""
-        patterns = [
-            # Specific pattern for "Bachelor of Science in Computer Science"
-            r'(Bachelor\s+of\s+Science\s+in\s+Computer\s+Science)',
-            # Program field patterns
-            r'Programme?:\s*([^\n\r]{10,80})',
-            r'Program:\s*([^\n\r]{10,80})',
-            r'Course:\s*([^\n\r]{10,80})',
-            # General Bachelor patterns
-            r'(Bachelor\s+of\s+Science\s+in\s+[A-Za-z\s]+)',
-            r'(Bachelor\s+of\s+Arts\s+in\s+[A-Za-z\s]+)',
-            r'(Bachelor\s+of\s+[A-Za-z\s]+)',
-            # Diploma patterns
-            r'(Diploma\s+in\s+[A-Za-z\s]+)',
-            # Look for program names in context
-            r'(?:studying|pursuing|enrolled\s+in)\s+([A-Za-z\s]{10,50})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        lowered_text = text.lower()
+        for anchors, pattern in _PROGRAM_PATTERNS:
+            if not any(anchor in lowered_text for anchor in anchors):
+                continue
+            match = pattern.search(text)
             if match:
                 program = match.group(1).strip()
                 # Clean up common OCR artifacts
-                program = re.sub(r'\s+', ' ', program)
+                program = _WHITESPACE_RE.sub(' ', program)
                 if len(program) >= 10:  # Ensure meaningful length
                     return program
         
@@ -246,39 +355,49 @@ class HybridDocumentParser:
 
     def _extract_academic_period_hybrid(self, text: str) -> Tuple[int, int]:
         """Extract year and semester"""
-        # Look for Y4S2 format (Stage format)
-        stage_match = re.search(r'Y(\d+)S(\d+)', text)
-        if stage_match:
-            return int(stage_match.group(1)), int(stage_match.group(2))
-        
-        # Look for Stage format (common in CUEA transcripts)
-        stage_pattern = re.search(r'Stage\s*(\d+)\s*Semester\s*(\d+)', text, re.IGNORECASE)
-        if stage_pattern:
-            return int(stage_pattern.group(1)), int(stage_pattern.group(2))
-        
-        # Look for explicit Year/Semester format
-        year_match = re.search(r'Year\s*(\d+)', text, re.IGNORECASE)
-        sem_match = re.search(r'Semester\s*(\d+)', text, re.IGNORECASE)
-        
-        # Try to determine from course progression or stage information
-        # Look for the highest stage/year mentioned in the transcript
-        all_years = re.findall(r'(?:Year|Stage|Y)\s*(\d+)', text, re.IGNORECASE)
-        all_semesters = re.findall(r'(?:Semester|Sem|S)\s*(\d+)', text, re.IGNORECASE)
+        # Precedence: the first Y4S2 code, then the first "Stage N Semester M",
+        # then the first explicit Year / Semester, then the highest
+        # year/stage and semester mentioned anywhere in the transcript
+        stage_period = None
+        first_year = first_semester = None
+        highest_year = highest_semester = None
+        
+        for match in _PERIOD_RE.finditer(text):
+            kind = match.lastgroup
+            if kind == 'code_semester':
+                return int(match.group('code_year')), int(match.group('code_semester'))
+            if kind == 'stage_semester':
+                if stage_period is None:
+                    stage_period = int(match.group('stage_year')), int(match.group('stage_semester'))
+            elif stage_period is not None:
+                # Only a later Y4S2 code can still change the result
+                continue
+            elif kind in ('year', 'any_year'):
+                value = int(match.group(kind))
+                if kind == 'year' and first_year is None:
+                    first_year = value
+                highest_year = value if highest_year is None else max(highest_year, value)
+            else:
+                value = int(match.group(kind))
+                if kind == 'semester' and first_semester is None:
+                    first_semester = value
+                highest_semester = value if highest_semester is None else max(highest_semester, value)
+        
+        if stage_period is not None:
+            return stage_period
         
         year = 4  # Default
         semester = 2  # Default
         
-        if year_match:
-            year = int(year_match.group(1))
-        elif all_years:
-            # Use the highest year found
-            year = max(int(y) for y in all_years)
+        if first_year is not None:
+            year = first_year
+        elif highest_year is not None:
+            year = highest_year
         
-        if sem_match:
-            semester = int(sem_match.group(1))
-        elif all_semesters:
-            # Use the highest semester found
-            semester = max(int(s) for s in all_semesters)
+        if first_semester is not None:
+            semester = first_semester
+        elif highest_semester is not None:
+            semester = highest_semester
         
         # Ensure valid ranges
         year = max(1, min(6, year))
@@ -290,91 +409,72 @@ class HybridDocumentParser:
         """
         Extract courses using multiple detection methods
         """
-        courses = []
-        found_codes = set()
-        
-        lines = text.split('\n')
-        
-        # Method 1: Look for structured course data
-        for line in lines:
-            line = line.strip()
-            if len(line) < 10:
-                continue
+        # Single scan: structured course rows and simple course codes. Rows
+        # take precedence over bare codes wherever they appear, so a code
+        # mentioned before its row (e.g. as a prerequisite) keeps the row's grade
+        row_courses = {}
+        code_courses = {}
+        
+        for match in _COURSE_RE.finditer(text):
+            if match.group('grade'):
+                code = match.group('row_code')
+                grade = match.group('grade')
+                found = row_courses
+                course = {
+                    'code': code,
+                    'title': match.group('title').strip(),
+                    'grade': grade,
+                    'units': 1,
+                    'status': 'complete' if grade != 'F' else 'incomplete',
+                    'confidence': 0.9
+                }
+            else:
+                code = match.group('code')
+                found = code_courses
+                course = {
+                    'code': code,
+                    'title': "Course",
+                    'grade': "A",  # Assume passed
+                    'units': 1,
+                    'status': 'complete',
+                    'confidence': 0.6
+                }
             
-            # Pattern for: CMT 108 INTRO. TO WEB DEVELOPMENT 24 50 74 A 3
-            match = re.search(r'([A-Z]{2,4}\s+\d{3,4})\s+([A-Z][A-Z\s\.\&/]{5,80})\s+\d+\s+\d+\s+\d+\s+([A-F][+-]?)\s+\d+', line)
-            if match:
-                code = match.group(1).strip()
-                title = match.group(2).strip()
-                grade = match.group(3).strip()
-                
-                if code not in found_codes:
-                    if CleanedUnit is not None:
-                        courses.append(CleanedUnit(
-                            code=code,
-                            title=title,
-                            grade=grade,
-                            units=1,
-                            status='complete' if grade and grade != 'F' else 'incomplete',
-                            confidence=0.9
-                        ))
-                    else:
-                        # Fallback course representation
-                        courses.append({
-                            'code': code,
-                            'title': title,
-                            'grade': grade,
-                            'units': 1,
-                            'status': 'complete' if grade and grade != 'F' else 'incomplete',
-                            'confidence': 0.9
-                        })
-                    found_codes.add(code)
-        
-        # Method 2: Simple course code detection
-        all_text = ' '.join(lines)
-        simple_codes = re.findall(r'\b([A-Z]{2,4}\s*\d{3,4}[A-Z]?)\b', all_text)
-        
-        for code in simple_codes:
             normalized_code = code.replace(' ', '').upper()
-            if normalized_code not in found_codes and len(normalized_code) >= 5:
-                if CleanedUnit is not None:
-                    courses.append(CleanedUnit(
-                        code=code,
-                        title="Course",
-                        grade="A",  # Assume passed
-                        units=1,
-                        status='complete',
-                        confidence=0.6
-                    ))
-                else:
-                    courses.append({
-                        'code': code,
-                        'title': "Course",
-                        'grade': "A",
-                        'units': 1,
-                        'status': 'complete',
-                        'confidence': 0.6
-                    })
-                found_codes.add(normalized_code)
+            if normalized_code in found or len(normalized_code) < 5:
+                continue
+            found[normalized_code] = course
         
+        courses = list(row_courses.values())
+        courses.extend(
+            course for normalized_code, course in code_courses.items()
+            if normalized_code not in row_courses
+        )
+        
+        # Fallback course representation is the plain dict
+        if CleanedUnit is not None:
+            courses = [CleanedUnit(**course) for course in courses]
         return courses
 
-    def _comprehensive_course_detection(self, all_texts: List[str]) -> List[Any]:
+    @staticmethod
+    def _iter_texts(ocr_result, min_length: int):
+        """The primary OCR text, then the text of every successful method
+        longer than ``min_length``"""
+        yield ocr_result.text
+        for method_result in ocr_result.methods_tried:
+            if method_result.success and method_result.text_length > min_length:
+                yield method_result.text
+
+    def _merge_courses(self, all_courses: List[Any], found_codes: set, courses: List[Any]) -> None:
         """
-        Detect courses across all OCR results and combine unique findings
+        Add the courses whose codes haven't been seen yet, combining unique
+        findings across OCR results
         """
-        all_courses = []
-        found_codes = set()
-        
-        for text in all_texts:
-            courses = self._extract_courses_hybrid(text)
-            for course in courses:
-                normalized_code = course.code.replace(' ', '').upper()
-                if normalized_code not in found_codes:
-                    all_courses.append(course)
-                    found_codes.add(normalized_code)
-        
-        return all_courses
+        for course in courses:
+            normalized_code = course.code.replace(' ', '').upper()
+            if normalized_code not in found_codes:
+                all_courses.append(course)
+                found_codes.add(normalized_code)
 
     def _select_best_extraction(self, candidates: List[HybridExtractionResult]) -> HybridExtractionResult:
         """
@@ -397,12 +497,17 @@ class HybridDocumentParser:
                 all_ocr_results=[]
             )
         
-        # Score each candidate
-        best_candidate = max(candidates, key=lambda x: (
-            x.confidence * 0.4 +
-            min(len(x.courses) / 20, 1.0) * 0.3 +  # Course count factor
-            (1.0 if x.student_name != "Unknown Student" else 0.0) * 0.3
-        ))
+        # Score each candidate; the first of equal scores wins
+        best_candidate = None
+        best_score = -1.0
+        for candidate in candidates:
+            score = (
+                candidate.confidence * 0.4 +
+                min(candidate.total_courses / 20, 1.0) * 0.3 +  # Course count factor
+                (0.3 if candidate.student_name != "Unknown Student" else 0.0)
+            )
+            if score > best_score:
+                best_candidate, best_score = candidate, score
         
         return best_candidate
 
@@ -432,8 +537,11 @@ class HybridDocumentParser:
         
         return min(confidence, 1.0)
 
-    def _is_valid_name_hybrid(self, name: str) -> bool:
-        """Check if a name candidate is valid"""
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _is_valid_name_hybrid(name: str) -> bool:
+        """Check if a name candidate is valid (cached: the same candidates
+        come up across patterns and OCR texts)"""
         if not name or len(name) < 5:
             return False
         
@@ -442,15 +550,7 @@ class HybridDocumentParser:
             return False
         
         # Check for academic/header words to exclude
-        exclude_words = {
-            'UNIT', 'CODE', 'DESCRIPTION', 'GRADE', 'CREDIT', 'OBJECT', 'ORIENTED',
-            'PROGRAMMING', 'COMPUTER', 'SCIENCE', 'BACHELOR', 'EASTERN', 'AFRICA',
-            'CATHOLIC', 'UNIVERSITY', 'ACADEMIC', 'REGISTRAR', 'TRANSCRIPT',
-            'STUDENT', 'NUMBER', 'STAGE', 'SEMESTER', 'YEAR', 'MARKS', 'POINTS',
-            'TOTAL', 'AVERAGE', 'COURSE', 'DEPARTMENT', 'FACULTY'
-        }
-        
-        if any(word.upper() in exclude_words for word in words):
+        if any(word.upper() in _EXCLUDED_NAME_WORDS for word in words):
             return False
         
         # All words should be capitalized and alphabetic
@@ -459,15 +559,9 @@ class HybridDocumentParser:
 
     def _clean_name_hybrid(self, name: str) -> str:
         """Clean and format name"""
-        words = name.split()
-        cleaned_words = []
-        
-        for word in words:
-            if word.isalpha() and len(word) > 1:
-                # Keep names in title case (first letter uppercase, rest lowercase)
-                cleaned_words.append(word.capitalize())
-        
-        return ' '.join(cleaned_words)
+        # Only called on names _is_valid_name_hybrid accepted, so every word is
+        # already alphabetic and 2+ letters; just normalize spacing and case
+        return ' '.join(name.split()).title()
 
 
 class HybridFeeStatementParser:
@@ -485,30 +579,37 @@ class HybridFeeStatementParser:
         """
         Parse fee statement with hybrid OCR approach
         """
+        # Same document as a recent upload: reuse its result
+        cache_key = _document_key(pdf_bytes)
+        cached = _get_cached_result(_fee_statement_results, cache_key)
+        if cached is not None:
+            logger.info("Hybrid parser reusing the result for an identical fee statement")
+            return dict(cached)
+        
         # Get multiple OCR results
         ocr_result = self.ocr_processor.process_document_comprehensive(pdf_bytes)
         
-        # Collect all text extractions
-        all_texts = [ocr_result.text]
-        for method_result in ocr_result.methods_tried:
-            if method_result.success and method_result.text_length > 50:
-                all_texts.append(method_result.text)
-        
-        # Try to find balance in each text
+        # Try to find balance in each text extraction
         best_balance = None
-        for text in all_texts:
+        for text in HybridDocumentParser._iter_texts(ocr_result, min_length=50):
             balance = self._extract_balance_hybrid(text)
             if balance is not None:
                 best_balance = balance
                 break
         
-        return {
+        result = {
             'balance': best_balance,
             'balance_display': f"KSH {best_balance:,.2f}" if best_balance is not None else "Unable to determine",
             'balance_cleared': best_balance == 0.0 if best_balance is not None else False,
             'confidence': ocr_result.confidence,
             'method': ocr_result.primary_method
         }
+        if best_balance is None:
+            return result
+        
+        # The values are scalars, so a shallow copy keeps the cache intact
+        _cache_result(_fee_statement_results, cache_key, result)
+        return dict(result)
     
     def _extract_balance_hybrid(self, text: str) -> Optional[float]:
         """
@@ -516,21 +617,23 @@ class HybridFeeStatementParser:
         """
         logger.info(f"Fee statement text preview: {text[:300]}")
         
-        lines = text.split('\n')
+        # Only the last 20 lines are searched; split those off without
+        # splitting the whole statement, and strip them once
+        tail_lines = [line.strip() for line in reversed(text.rsplit('\n', 20)[-20:])]
         
         # Method 1: Look for lines ending with just "-" (zero balance)
-        for line in reversed(lines[-20:]):
-            line = line.strip()
-            if line.endswith(' -') or line.endswith('-'):
+        for line in tail_lines:
+            if line.endswith('-'):
                 logger.info(f"Found zero balance line: {line}")
                 return 0.0
         
         # Method 2: Look for final balance numbers
-        for line in reversed(lines[-20:]):
-            line = line.strip()
+        for line in tail_lines:
+            if len(line) <= 20:
+                continue
             # Look for lines with multiple numbers ending with a final balance
-            numbers = re.findall(r'\d{1,6}\.?\d{0,2}', line)
-            if len(numbers) >= 2 and len(line) > 20:
+            numbers = _BALANCE_NUMBER_RE.findall(line)
+            if len(numbers) >= 2:
                 try:
                     final_balance = float(numbers[-1])
                     logger.info(f"Found final balance: {final_balance} from line: {line}")
@@ -539,14 +642,9 @@ class HybridFeeStatementParser:
                     continue
         
         # Method 3: Look for explicit balance statements
-        balance_patterns = [
-            r'outstanding\s+balance[:\s]*([+-]?[\d,]+\.?\d*|\-)',
-            r'balance[:\s]*([+-]?[\d,]+\.?\d*|\-)',
-            r'total[:\s]*([+-]?[\d,]+\.?\d*|\-)',
-        ]
-        
-        for pattern in balance_patterns:
-            match = re.search(pattern, text.lower())
+        lowered_text = text.lower()
+        for pattern in _BALANCE_PATTERNS:
+            match = pattern.search(lowered_text)
             if match:
                 balance_str = match.group(1)
                 if balance_str == '-':
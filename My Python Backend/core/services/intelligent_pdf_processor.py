@@ -4,8 +4,11 @@ Uses multiple heuristics to detect PDF type and apply optimal extraction method
 """
 
 import io
+import os
 import logging
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from pathlib import Path
@@ -18,7 +21,6 @@ from pdfminer.layout import LAParams
 
 # OCR Libraries
 import pytesseract
-from PIL import Image
 import cv2
 import numpy as np
 
@@ -26,8 +28,23 @@ import numpy as np
 import re
 from difflib import SequenceMatcher
 
+from .transcript_data_extractor import TranscriptDataExtractor
+
 logger = logging.getLogger(__name__)
 
+# Scanned pages OCR'd at once. pytesseract runs the tesseract binary, so
+# threads are enough; each run is itself multi-threaded, hence the quarter
+OCR_PAGE_WORKERS = max(1, (os.cpu_count() or 1) // 4)
+
+# Common transcript patterns used to score extracted text, compiled once
+_TEXT_QUALITY_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'[A-Z]{2,4}\s*\d{3,4}',  # Course codes
+    r'[A-F][+-]?|\bPass\b|\bFail\b',  # Grades
+    r'\d+\s*(?:units?|credits?)',  # Units
+    r'GPA|CGPA',  # GPA indicators
+    r'Semester|Year|Program'  # Academic terms
+))
+
 @dataclass
 class PDFAnalysisResult:
     """Results from PDF structure analysis"""
@@ -71,6 +88,17 @@ class IntelligentPDFProcessor:
     Advanced PDF processor with intelligent type detection and optimal extraction
     """
     
+    # Digital text scoring at least this well skips the slower extractors
+    GOOD_TEXT_QUALITY = 0.4
+    
+    # Pages whose words OCR below this mean confidence (0-100) are retried
+    # with the slower non-local-means denoiser
+    RETRY_OCR_CONFIDENCE = 60
+    
+    # Structure analysis stops early once digital and scanned indicators are
+    # this far apart, since later pages won't change the verdict
+    DECISIVE_INDICATOR_MARGIN = 10
+    
     def __init__(self):
         self.tesseract_config = {
             'lang': 'eng',
@@ -83,6 +111,9 @@ class IntelligentPDFProcessor:
             'program', 'degree', 'university', 'college', 'gpa', 'credit'
         ]
         
+        # Structures the extracted text (stateless, so one per processor)
+        self.transcript_extractor = TranscriptDataExtractor()
+        
     def analyze_pdf_structure(self, pdf_bytes: bytes) -> PDFAnalysisResult:
         """
         Analyze PDF structure using multiple heuristics to determine optimal extraction method
@@ -91,95 +122,98 @@ class IntelligentPDFProcessor:
         
         try:
             # Open with PyMuPDF for detailed analysis
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            page_count = len(doc)
-            
-            analysis_details = {
-                'text_blocks_per_page': [],
-                'image_blocks_per_page': [],
-                'font_coverage': [],
-                'text_density': [],
-                'extraction_methods_tested': []
-            }
-            
-            total_text_coverage = 0
-            has_fonts = False
-            has_images = False
-            digital_indicators = 0
-            scanned_indicators = 0
-            
-            # Analyze each page (limit to first 5 pages for performance)
-            pages_to_analyze = min(5, page_count)
-            
-            for page_num in range(pages_to_analyze):
-                page = doc[page_num]
-                
-                # Heuristic 1: Check for extractable text blocks
-                text_blocks = page.get_text("dict")
-                text_block_count = len(text_blocks.get('blocks', []))
-                analysis_details['text_blocks_per_page'].append(text_block_count)
+            with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+                page_count = len(doc)
                 
-                if text_block_count > 5:  # Significant text content
-                    digital_indicators += 2
-                
-                # Heuristic 2: Analyze fonts and text layout
-                font_info = []
-                for block in text_blocks.get('blocks', []):
-                    if 'lines' in block:
-                        for line in block['lines']:
-                            for span in line.get('spans', []):
-                                font_info.append({
-                                    'font': span.get('font', ''),
-                                    'size': span.get('size', 0),
-                                    'text': span.get('text', '')
-                                })
-                
-                if font_info:
-                    has_fonts = True
-                    font_coverage = len([f for f in font_info if f['text'].strip()])
-                    analysis_details['font_coverage'].append(font_coverage)
-                    digital_indicators += 1
-                
-                # Heuristic 3: Check for images and their characteristics
-                image_list = page.get_images()
-                image_count = len(image_list)
-                analysis_details['image_blocks_per_page'].append(image_count)
-                
-                if image_count > 0:
-                    has_images = True
-                    # Large images that cover most of the page suggest scanned content
-                    for img_index, img in enumerate(image_list):
-                        try:
-                            xref = img[0]
-                            pix = fitz.Pixmap(doc, xref)
-                            if pix.width > 1000 and pix.height > 1000:  # Large image
-                                scanned_indicators += 2
-                            pix = None  # Free memory
-                        except:
-                            pass
+                analysis_details = {
+                    'text_blocks_per_page': [],
+                    'image_blocks_per_page': [],
+                    'font_coverage': [],
+                    'text_density': [],
+                    'extraction_methods_tested': []
+                }
                 
-                # Heuristic 4: Text density analysis
-                page_text = page.get_text()
-                page_area = page.rect.width * page.rect.height
-                text_density = len(page_text) / page_area if page_area > 0 else 0
-                analysis_details['text_density'].append(text_density)
+                total_text_coverage = 0
+                has_fonts = False
+                has_images = False
+                digital_indicators = 0
+                scanned_indicators = 0
                 
-                if text_density > 0.01:  # Good text density suggests digital PDF
-                    digital_indicators += 1
-                elif text_density < 0.001:  # Very low density suggests scanned
-                    scanned_indicators += 1
+                # Analyze each page (limit to first 5 pages for performance)
+                pages_to_analyze = min(5, page_count)
+                pages_analyzed = 0
                 
-                # Heuristic 5: Test extraction quality
-                extracted_text = page.get_text()
-                if len(extracted_text.strip()) > 100:
-                    # Check if extracted text looks meaningful
-                    academic_keyword_count = sum(1 for keyword in self.academic_keywords 
-                                               if keyword.lower() in extracted_text.lower())
-                    if academic_keyword_count >= 2:
+                for page_num in range(pages_to_analyze):
+                    page = doc[page_num]
+                    pages_analyzed += 1
+                    
+                    # Heuristic 1: Check for extractable text blocks. This is the only
+                    # pass over the page's content; the text below is built from it
+                    text_blocks = page.get_text("dict")
+                    blocks = text_blocks.get('blocks', [])
+                    text_block_count = len(blocks)
+                    analysis_details['text_blocks_per_page'].append(text_block_count)
+                    
+                    if text_block_count > 5:  # Significant text content
                         digital_indicators += 2
-                        total_text_coverage += len(extracted_text) / 1000  # Normalize
-                
-            doc.close()
+                    
+                    # Heuristic 2: Analyze fonts and text layout
+                    font_coverage = 0
+                    has_spans = False
+                    text_lines = []
+                    for block in blocks:
+                        if 'lines' in block:
+                            for line in block['lines']:
+                                line_text = []
+                                for span in line.get('spans', []):
+                                    has_spans = True
+                                    span_text = span.get('text', '')
+                                    if span_text.strip():
+                                        font_coverage += 1
+                                    line_text.append(span_text)
+                                text_lines.append(''.join(line_text))
+                    
+                    if has_spans:
+                        has_fonts = True
+                        analysis_details['font_coverage'].append(font_coverage)
+                        digital_indicators += 1
+                    
+                    # Heuristic 3: Check for images and their characteristics
+                    image_list = page.get_images()
+                    image_count = len(image_list)
+                    analysis_details['image_blocks_per_page'].append(image_count)
+                    
+                    if image_count > 0:
+                        has_images = True
+                        # Large images that cover most of the page suggest scanned content.
+                        # get_images() already lists each image's width and height, so
+                        # nothing needs decoding
+                        for img in image_list:
+                            width, height = img[2], img[3]
+                            if width > 1000 and height > 1000:  # Large image
+                                scanned_indicators += 2
+                    
+                    # Heuristic 4: Text density analysis
+                    page_text = '\n'.join(text_lines)
+                    page_area = page.rect.width * page.rect.height
+                    text_density = len(page_text) / page_area if page_area > 0 else 0
+                    analysis_details['text_density'].append(text_density)
+                    
+                    if text_density > 0.01:  # Good text density suggests digital PDF
+                        digital_indicators += 1
+                    elif text_density < 0.001:  # Very low density suggests scanned
+                        scanned_indicators += 1
+                    
+                    # Heuristic 5: Test extraction quality
+                    if len(page_text.strip()) > 100:
+                        # Check if extracted text looks meaningful
+                        academic_keyword_count = self._count_academic_keywords(page_text, limit=2)
+                        if academic_keyword_count >= 2:
+                            digital_indicators += 2
+                            total_text_coverage += len(page_text) / 1000  # Normalize
+                    
+                    if abs(digital_indicators - scanned_indicators) >= self.DECISIVE_INDICATOR_MARGIN:
+                        break
             
             # Determine PDF type based on heuristics
             is_digital = digital_indicators > scanned_indicators
@@ -188,8 +222,8 @@ class IntelligentPDFProcessor:
             total_indicators = digital_indicators + scanned_indicators
             confidence = max(digital_indicators, scanned_indicators) / max(total_indicators, 1)
             
-            # Calculate average text coverage
-            text_coverage = min(total_text_coverage / pages_to_analyze, 100.0)
+            # Calculate average text coverage over the pages actually analyzed
+            text_coverage = min(total_text_coverage / max(pages_analyzed, 1), 100.0)
             
             # Determine extraction method
             if is_digital and text_coverage > 20:
@@ -202,6 +236,7 @@ class IntelligentPDFProcessor:
             analysis_details.update({
                 'digital_indicators': digital_indicators,
                 'scanned_indicators': scanned_indicators,
+                'pages_analyzed': pages_analyzed,
                 'analysis_time': time.time() - start_time
             })
             
@@ -234,23 +269,27 @@ class IntelligentPDFProcessor:
     
     def extract_digital_text(self, pdf_bytes: bytes) -> ExtractionResult:
         """
-        Extract text from digital PDFs using multiple libraries for best results
+        Extract text from digital PDFs, starting with PyMuPDF and only falling
+        back to pdfplumber/pdfminer when its output scores poorly
         """
         start_time = time.time()
         errors = []
         best_text = ""
         best_method = ""
         best_confidence = 0.0
+        methods_tried = []
+        page_count = 1
         
         # Method 1: PyMuPDF (fastest and handles complex layouts well)
         try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            pymupdf_text = ""
-            for page_num in range(min(len(doc), 20)):  # Limit pages for performance
-                page = doc[page_num]
-                page_text = page.get_text()
-                pymupdf_text += f"\n--- Page {page_num + 1} ---\n{page_text}"
-            doc.close()
+            methods_tried.append('pymupdf')
+            page_texts = []
+            with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+                page_count = len(doc)
+                for page_num in range(min(page_count, 20)):  # Limit pages for performance
+                    page_text = doc[page_num].get_text()
+                    page_texts.append(f"\n--- Page {page_num + 1} ---\n{page_text}")
+            pymupdf_text = "".join(page_texts)
             
             pymupdf_confidence = self._calculate_text_quality(pymupdf_text)
             if pymupdf_confidence > best_confidence:
@@ -265,58 +304,53 @@ class IntelligentPDFProcessor:
             logger.warning(f"PyMuPDF extraction failed: {str(e)}")
         
         # Method 2: pdfplumber (excellent for tables and structured data)
-        try:
-            with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-                pdfplumber_text = ""
-                for page_num, page in enumerate(pdf.pages[:20]):  # Limit pages
-                    page_text = page.extract_text() or ""
-                    pdfplumber_text += f"\n--- Page {page_num + 1} ---\n{page_text}"
-            
-            pdfplumber_confidence = self._calculate_text_quality(pdfplumber_text)
-            if pdfplumber_confidence > best_confidence:
-                best_text = pdfplumber_text
-                best_method = "pdfplumber"
-                best_confidence = pdfplumber_confidence
+        if best_confidence < self.GOOD_TEXT_QUALITY:
+            try:
+                methods_tried.append('pdfplumber')
+                with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+                    pdfplumber_text = ""
+                    for page_num, page in enumerate(pdf.pages[:20]):  # Limit pages
+                        page_text = page.extract_text() or ""
+                        pdfplumber_text += f"\n--- Page {page_num + 1} ---\n{page_text}"
                 
-            logger.info(f"pdfplumber: {len(pdfplumber_text)} chars, {pdfplumber_confidence:.2f} confidence")
-            
-        except Exception as e:
-            errors.append(f"pdfplumber failed: {str(e)}")
-            logger.warning(f"pdfplumber extraction failed: {str(e)}")
+                pdfplumber_confidence = self._calculate_text_quality(pdfplumber_text)
+                if pdfplumber_confidence > best_confidence:
+                    best_text = pdfplumber_text
+                    best_method = "pdfplumber"
+                    best_confidence = pdfplumber_confidence
+                    
+                logger.info(f"pdfplumber: {len(pdfplumber_text)} chars, {pdfplumber_confidence:.2f} confidence")
+                
+            except Exception as e:
+                errors.append(f"pdfplumber failed: {str(e)}")
+                logger.warning(f"pdfplumber extraction failed: {str(e)}")
         
         # Method 3: pdfminer (robust for complex layouts)
-        try:
-            laparams = LAParams(
-                word_margin=0.1,
-                char_margin=2.0,
-                line_margin=0.5,
-                boxes_flow=0.5
-            )
-            pdfminer_text = pdfminer_extract_text(io.BytesIO(pdf_bytes), laparams=laparams)
-            
-            pdfminer_confidence = self._calculate_text_quality(pdfminer_text)
-            if pdfminer_confidence > best_confidence:
-                best_text = pdfminer_text
-                best_method = "pdfminer"
-                best_confidence = pdfminer_confidence
+        if best_confidence < self.GOOD_TEXT_QUALITY:
+            try:
+                methods_tried.append('pdfminer')
+                laparams = LAParams(
+                    word_margin=0.1,
+                    char_margin=2.0,
+                    line_margin=0.5,
+                    boxes_flow=0.5
+                )
+                pdfminer_text = pdfminer_extract_text(io.BytesIO(pdf_bytes), laparams=laparams)
                 
-            logger.info(f"pdfminer: {len(pdfminer_text)} chars, {pdfminer_confidence:.2f} confidence")
-            
-        except Exception as e:
-            errors.append(f"pdfminer failed: {str(e)}")
-            logger.warning(f"pdfminer extraction failed: {str(e)}")
+                pdfminer_confidence = self._calculate_text_quality(pdfminer_text)
+                if pdfminer_confidence > best_confidence:
+                    best_text = pdfminer_text
+                    best_method = "pdfminer"
+                    best_confidence = pdfminer_confidence
+                    
+                logger.info(f"pdfminer: {len(pdfminer_text)} chars, {pdfminer_confidence:.2f} confidence")
+                
+            except Exception as e:
+                errors.append(f"pdfminer failed: {str(e)}")
+                logger.warning(f"pdfminer extraction failed: {str(e)}")
         
         processing_time = time.time() - start_time
         
-        # Count pages for metadata
-        page_count = 1
-        try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            page_count = len(doc)
-            doc.close()
-        except:
-            pass
-        
         return ExtractionResult(
             text=best_text,
             method=f"digital_{best_method}",
@@ -325,7 +359,7 @@ class IntelligentPDFProcessor:
             page_count=page_count,
             errors=errors,
             metadata={
-                'extraction_methods_tried': ['pymupdf', 'pdfplumber', 'pdfminer'],
+                'extraction_methods_tried': methods_tried,
                 'best_method': best_method,
                 'text_length': len(best_text)
             }
@@ -339,57 +373,21 @@ class IntelligentPDFProcessor:
         errors = []
         
         try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            full_text = ""
+            page_texts = []
             total_confidence = 0.0
             pages_processed = 0
             
-            for page_num in range(min(len(doc), 15)):  # Limit pages for performance
-                try:
-                    page = doc[page_num]
-                    
-                    # Convert page to high-resolution image
-                    mat = fitz.Matrix(2.0, 2.0)  # 2x scaling for better OCR
-                    pix = page.get_pixmap(matrix=mat)
-                    img_data = pix.tobytes("png")
-                    pix = None  # Free memory
-                    
-                    # Convert to PIL Image
-                    image = Image.open(io.BytesIO(img_data))
-                    
-                    # Preprocess image for better OCR
-                    processed_image = self._preprocess_image_for_ocr(image)
-                    
-                    # Run OCR with optimized settings
-                    ocr_result = pytesseract.image_to_data(
-                        processed_image,
-                        lang=self.tesseract_config['lang'],
-                        config=self.tesseract_config['config'],
-                        output_type=pytesseract.Output.DICT
-                    )
+            # The document is closed even if OCR fails part way
+            with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+                # Limit pages for performance
+                for page_num, page_text, page_confidence in self._iter_ocr_pages(doc, 15, errors):
+                    page_texts.append(f"\n--- Page {page_num + 1} ---\n{page_text}")
+                    total_confidence += page_confidence
+                    pages_processed += 1
                     
-                    # Extract text and calculate page confidence
-                    page_text = " ".join([
-                        text for text, conf in zip(ocr_result['text'], ocr_result['conf'])
-                        if int(conf) > 30 and text.strip()  # Filter low-confidence words
-                    ])
-                    
-                    if page_text.strip():
-                        full_text += f"\n--- Page {page_num + 1} ---\n{page_text}"
-                        page_confidence = np.mean([
-                            int(conf) for conf in ocr_result['conf'] 
-                            if int(conf) > 0
-                        ])
-                        total_confidence += page_confidence
-                        pages_processed += 1
-                        
-                        logger.info(f"OCR Page {page_num + 1}: {len(page_text)} chars, {page_confidence:.1f}% confidence")
-                    
-                except Exception as e:
-                    errors.append(f"OCR failed for page {page_num + 1}: {str(e)}")
-                    logger.warning(f"OCR failed for page {page_num + 1}: {str(e)}")
+                    logger.info(f"OCR Page {page_num + 1}: {len(page_text)} chars, {page_confidence:.1f}% confidence")
             
-            doc.close()
+            full_text = "".join(page_texts)
             
             # Calculate overall confidence
             overall_confidence = (total_confidence / pages_processed / 100.0) if pages_processed > 0 else 0.0
@@ -425,13 +423,113 @@ class IntelligentPDFProcessor:
                 metadata={'fatal_error': str(e)}
             )
     
-    def _preprocess_image_for_ocr(self, image: Image.Image) -> Image.Image:
+    def _iter_ocr_pages(self, doc, max_pages: int, errors: List[str]):
+        """
+        Yield (page_num, text, confidence) for each page with text, in page order
+        
+        Pages are rendered here, since a PyMuPDF document can't be shared
+        between threads, and OCR'd on a pool with at most OCR_PAGE_WORKERS
+        pages in flight. Failed pages are recorded in `errors`.
+        """
+        def collect(page_num, future):
+            try:
+                page_text, page_confidence = future.result()
+            except Exception as e:
+                errors.append(f"OCR failed for page {page_num + 1}: {str(e)}")
+                logger.warning(f"OCR failed for page {page_num + 1}: {str(e)}")
+                return None
+            if not page_text.strip():
+                return None
+            return page_num, page_text, page_confidence
+        
+        with ThreadPoolExecutor(max_workers=OCR_PAGE_WORKERS) as executor:
+            in_flight = deque()
+            for page_num in range(min(len(doc), max_pages)):
+                try:
+                    image = self._render_page_for_ocr(doc[page_num])
+                except Exception as e:
+                    errors.append(f"OCR failed for page {page_num + 1}: {str(e)}")
+                    logger.warning(f"OCR failed for page {page_num + 1}: {str(e)}")
+                    continue
+                
+                in_flight.append((page_num, executor.submit(self._ocr_page, image)))
+                image = None  # Only the worker holds the page now
+                if len(in_flight) >= OCR_PAGE_WORKERS:
+                    page = collect(*in_flight.popleft())
+                    if page:
+                        yield page
+            
+            while in_flight:
+                page = collect(*in_flight.popleft())
+                if page:
+                    yield page
+    
+    def _render_page_for_ocr(self, page) -> np.ndarray:
+        """
+        Render a page to a high-resolution grayscale array for OCR
+        
+        PyMuPDF renders straight to grayscale and the samples are wrapped as
+        an array, instead of encoding a PNG only to decode it again.
+        """
+        mat = fitz.Matrix(2.0, 2.0)  # 2x scaling for better OCR
+        pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+        img_gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+        pix = None  # Free memory
+        
+        return img_gray
+    
+    def _ocr_page(self, image: np.ndarray) -> Tuple[str, float]:
+        """
+        Preprocess and OCR one page image, returning its text and mean word confidence
+        """
+        page_text, page_confidence = self._run_tesseract(self._preprocess_image_for_ocr(image))
+        
+        # Pages that came out with no words at all (blank or back-side scans)
+        # aren't retried; only pages with low-confidence text are
+        if page_text.strip() and page_confidence < self.RETRY_OCR_CONFIDENCE:
+            retry_text, retry_confidence = self._run_tesseract(
+                self._preprocess_image_for_ocr(image, denoise='heavy')
+            )
+            if retry_confidence > page_confidence:
+                page_text, page_confidence = retry_text, retry_confidence
+        
+        return page_text, page_confidence
+    
+    def _run_tesseract(self, processed_image: np.ndarray) -> Tuple[str, float]:
+        """
+        OCR a preprocessed image, returning its text and mean word confidence
+        """
+        # Run OCR with optimized settings
+        ocr_result = pytesseract.image_to_data(
+            processed_image,
+            lang=self.tesseract_config['lang'],
+            config=self.tesseract_config['config'],
+            output_type=pytesseract.Output.DICT
+        )
+        
+        # Extract text and calculate page confidence, over all words at once
+        confs = np.asarray(ocr_result['conf'], dtype=np.float64).astype(np.int32)
+        texts = np.asarray(ocr_result['text'], dtype=str)
+        keep = (confs > 30) & (np.char.strip(texts) != '')  # Filter low-confidence words
+        page_text = " ".join(texts[keep].tolist())
+        
+        page_confidence = 0.0
+        if page_text.strip():
+            page_confidence = float(confs[confs > 0].mean())
+        
+        return page_text, page_confidence
+    
+    def _preprocess_image_for_ocr(self, image, denoise: str = 'light') -> np.ndarray:
         """
         Apply image preprocessing to improve OCR accuracy
+        
+        Accepts a PIL image or an array; grayscale arrays are used as they are.
+        The result is an array, which pytesseract takes directly.
+        denoise='heavy' uses non-local means instead of a 3x3 Gaussian blur,
+        for pages that OCR poorly after the light pass.
         """
         try:
-            # Convert PIL to OpenCV
-            img_array = np.array(image)
+            img_array = np.asarray(image)
             if len(img_array.shape) == 3:
                 img_gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
             else:
@@ -439,7 +537,10 @@ class IntelligentPDFProcessor:
             
             # Apply preprocessing techniques
             # 1. Noise reduction
-            img_denoised = cv2.fastNlMeansDenoising(img_gray)
+            if denoise == 'heavy':
+                img_denoised = cv2.fastNlMeansDenoising(img_gray)
+            else:
+                img_denoised = cv2.GaussianBlur(img_gray, (3, 3), 0)
             
             # 2. Contrast enhancement
             clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
@@ -451,13 +552,26 @@ class IntelligentPDFProcessor:
                 cv2.THRESH_BINARY, 11, 2
             )
             
-            # Convert back to PIL
-            return Image.fromarray(img_binary)
+            return img_binary
             
         except Exception as e:
             logger.warning(f"Image preprocessing failed: {str(e)}, using original")
             return image
     
+    def _count_academic_keywords(self, text: str, limit: int) -> int:
+        """
+        Count distinct academic keywords in the text, stopping once `limit`
+        are found since callers only care about reaching a threshold
+        """
+        text_lower = text.lower()
+        count = 0
+        for keyword in self.academic_keywords:
+            if keyword in text_lower:
+                count += 1
+                if count >= limit:
+                    break
+        return count
+    
     def _calculate_text_quality(self, text: str) -> float:
         """
         Calculate quality score for extracted text based on academic content
@@ -468,8 +582,7 @@ class IntelligentPDFProcessor:
         score = 0.0
         
         # Check for academic keywords
-        academic_keyword_count = sum(1 for keyword in self.academic_keywords 
-                                   if keyword.lower() in text.lower())
+        academic_keyword_count = self._count_academic_keywords(text, limit=5)
         score += min(academic_keyword_count * 0.1, 0.5)  # Max 0.5 from keywords
         
         # Check text structure
@@ -480,16 +593,8 @@ class IntelligentPDFProcessor:
             score += 0.2  # Good line structure
         
         # Check for common transcript patterns
-        patterns = [
-            r'[A-Z]{2,4}\s*\d{3,4}',  # Course codes
-            r'[A-F][+-]?|\bPass\b|\bFail\b',  # Grades
-            r'\d+\s*(?:units?|credits?)',  # Units
-            r'GPA|CGPA',  # GPA indicators
-            r'Semester|Year|Program'  # Academic terms
-        ]
-        
-        pattern_matches = sum(1 for pattern in patterns 
-                            if re.search(pattern, text, re.IGNORECASE))
+        pattern_matches = sum(1 for pattern in _TEXT_QUALITY_PATTERNS 
+                            if pattern.search(text))
         score += min(pattern_matches * 0.05, 0.3)  # Max 0.3 from patterns
         
         return min(score, 1.0)  # Cap at 1.0
@@ -526,8 +631,4 @@ class IntelligentPDFProcessor:
         """
         Extract and structure transcript data from raw text
         """
-        from .transcript_data_extractor import TranscriptDataExtractor
-        
-        # Use the existing transcript data extractor
-        extractor = TranscriptDataExtractor()
-        return extractor.extract_structured_data(text)
\ No newline at end of file
+        return self.transcript_extractor.extract_structured_data(text)
\ No newline at end of file
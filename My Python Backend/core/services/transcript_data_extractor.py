@@ -8,10 +8,142 @@ import logging
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from difflib import SequenceMatcher
+from functools import lru_cache
 import unicodedata
 
+try:
+    from rapidfuzz import fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Extraction patterns, compiled once at import instead of on every call
+_NAME_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Specific patterns based on the user's transcript format
+    r'Name:\s*([A-Z][A-Z\s]{10,50})\s*Stage',  # "Name: EASTON MICHURA OCHIENG Stage"
+    r'Name:\s*([A-Z][A-Z\s]{10,50})',
+    
+    # Names from fee statement format: "Name: EASTON MICHURA OCHIENG Stage: Y4S2"
+    r'Name:\s*([A-Z\s]{10,50})\s*Stage:',
+    
+    # All caps names with stage info
+    r'([A-Z]{2,}\s+[A-Z]{2,}\s+[A-Z]{2,})\s+Stage',
+    
+    # All caps names before student number or program info
+    r'([A-Z]{2,}\s+[A-Z]{2,}\s+[A-Z]{2,})\s*(?:\d{6,8}|Student|Programme|Program)',
+    
+    # Standard patterns
+    r'(?:student\s+name|name\s+of\s+student|full\s+name)[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})',
+    r'(?:name)[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})',
+    
+    # Names before ID/registration numbers
+    r'([A-Z][A-Z\s]{10,40})\s*(?:ID|STUDENT|REG|ADMISSION|\d{6,8})',
+    
+    # Names in proper case
+    r'\b([A-Z][a-z]{2,}\s+[A-Z][a-z]{2,}(?:\s+[A-Z][a-z]{2,}){0,2})\b',
+    
+    # Names after titles
+    r'(?:MR|MS|MISS|DR|PROF)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})'
+))
+
+# Fallback: any sequence of 2-4 capitalized words
+_FALLBACK_NAME_RE = re.compile(r'\b([A-Z][a-z]{2,}\s+[A-Z][a-z]{2,}(?:\s+[A-Z][a-z]{2,}){0,2})\b')
+
+_STUDENT_ID_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Specific patterns for this transcript format
+    r'(?:Student\s+No|Admission\s+Number):\s*(\d{6,8})',
+    r'#(\d{6,8})\s+Page',  # Found in transcript: #1046098 Page 1 of 3
+    r'(?:student\s+id|id\s+number|registration)[:\s]+([A-Z0-9]{6,15})',
+    r'(?:id)[:\s]+([A-Z0-9]{6,15})',
+    r'\b([A-Z]{2,3}\d{6,10})\b',  # Common ID format
+    r'\b(\d{6,8})\b'  # Numeric ID - specific length
+))
+
+_PROGRAM_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Specific to transcript format: Programme: Bachelor of Science in Computer Science
+    r'Programme:\s*([^\n\r]{10,80})',
+    r'Program:\s*([^\n\r]{10,80})',
+    r'(?:course|program|degree|study)[:\s]+([^\n\r]{10,80})',
+    r'(?:bachelor|master|diploma|certificate)\s+(?:of\s+)?([^\n\r]{5,50})',
+    r'(?:bsc|ba|msc|ma|phd|btech|bcom)\s+([^\n\r]{5,50})',
+    r'(Bachelor\s+of\s+Science\s+in\s+Computer\s+Science)',  # Exact match for this case
+    r'(computer\s+science|information\s+technology|engineering|business|medicine|law|education)'
+))
+
+# Year patterns - specific to transcript format: Stage: Y4S2
+_YEAR_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'Stage:\s*Y(\d+)S\d+',  # Stage: Y4S2 format
+    r'year[:\s]*(\d+)',
+    r'(?:level|class)[:\s]*(\d+)',
+    r'(\d+)(?:st|nd|rd|th)\s+year'
+))
+
+# Semester patterns - specific to transcript format: Stage: Y4S2
+_SEMESTER_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'Stage:\s*Y\d+S(\d+)',  # Stage: Y4S2 format
+    r'semester[:\s]*(\d+)',
+    r'sem[:\s]*(\d+)',
+    r'term[:\s]*(\d+)'
+))
+
+# Course history periods like "JAN-APR25"
+_SEMESTER_ENTRY_RE = re.compile(r'(JAN-APR|SEPT-DEC|MAY-AUG)(\d{2})')
+
+# Look for course codes in the format: ABC 123 or ABC123
+_COURSE_CODE_RE = re.compile(r'\b([A-Z]{2,4}\s*\d{3,4}[A-Z]?)\b')
+
+# Course code split into letters and number, for normalizing
+_COURSE_CODE_PARTS_RE = re.compile(r'\b([A-Z]{2,4})\s*(\d{3,4}[A-Z]?)\b')
+
+# Enhanced unit patterns specific to this transcript format
+_UNIT_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Transcript format: CMT 108 INTRO. TO WEB DEVELOPMENT 24 50 74 A 3
+    # Code Title Cat Exam Mark Total Score Grade Credit
+    r'([A-Z]{2,4}\s+\d{3,4})\s+([A-Z][A-Z\s\.\&]{8,60})\s+\d+\s+\d+\s+\d+\s+([A-F][+-]?|[DIXZ])\s+(\d+)',
+    
+    # Alternative format with different spacing
+    r'([A-Z]{2,4}\s+\d{3,4})\s+([A-Z][A-Z\s\.\&/]{5,50})\s+(?:\d+\s+){2,3}([A-F][+-]?|[DIXZ])\s+(\d+)',
+    
+    # Standard format: CIT 3105 – Machine Learning – A
+    r'([A-Z]{2,4}\s*\d{3,4}[A-Z]?)\s*[–-]\s*([^–-]+)\s*[–-]\s*([A-F][+-]?|[IXZ]|PASS|FAIL)',
+    
+    # Tabular format: CIT3105 | Machine Learning | 3 | A
+    r'([A-Z]{2,4}\d{3,4})\s*\|\s*([^|]+)\s*\|\s*(\d+)\s*\|\s*([A-F][+-]?|[IXZ])',
+    
+    # Simple format: CIT3105 Machine Learning A
+    r'([A-Z]{2,4}\s*\d{3,4})\s+([A-Za-z\s]{10,50})\s+([A-F][+-]?|[IXZ])',
+    
+    # With units: CIT 3105 Machine Learning (3) A
+    r'([A-Z]{2,4}\s*\d{3,4})\s+([^()]+)\s*\((\d+)\)\s*([A-F][+-]?|[IXZ])'
+))
+
+_SIMPLE_COURSE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\b[A-Z]{2,4}\d{3,4}\b',  # Simple format: ABC123
+    r'\b[A-Z]{3,4}\s+\d{3,4}\b',  # Spaced format: ABC 123
+))
+
+_GPA_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(?:gpa|cgpa)[:\s]*(\d+\.?\d*)',
+    r'grade\s+point\s+average[:\s]*(\d+\.?\d*)'
+))
+
+# Common OCR letter confusions, fixed in one pass
+_OCR_FIXES = {
+    'rn': 'm',
+    'cl': 'd',
+    'vv': 'w',
+    'ii': 'n',
+}
+_OCR_FIX_RE = re.compile('|'.join(_OCR_FIXES))
+
+_LETTER_GRADE_RE = re.compile(r'^[A-F][+-]?$')
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9\s]')
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z\s]')
+
 @dataclass
 class CleanedUnit:
     """Represents a cleaned and normalized academic unit"""
@@ -41,8 +173,10 @@ class NameMatcher:
     """Advanced fuzzy name matching with multiple algorithms"""
     
     @staticmethod
+    @lru_cache(maxsize=1024)
     def normalize_name(name: str) -> str:
-        """Normalize name for comparison"""
+        """Normalize name for comparison (cached: match_names normalizes
+        each name twice, and registered names recur across uploads)"""
         if not name:
             return ""
         
@@ -51,8 +185,8 @@ class NameMatcher:
         name = ''.join(c for c in name if unicodedata.category(c) != 'Mn')
         
         # Clean and normalize
-        name = re.sub(r'[^a-zA-Z\s]', '', name)  # Remove non-alphabetic
-        name = re.sub(r'\s+', ' ', name)  # Normalize whitespace
+        name = _NON_ALPHA_RE.sub('', name)  # Remove non-alphabetic
+        name = _WHITESPACE_RE.sub(' ', name)  # Normalize whitespace
         name = name.strip().lower()
         
         # Sort name parts for order-independent comparison
@@ -71,8 +205,11 @@ class NameMatcher:
         if norm1 == norm2:
             return 1.0
         
-        # Sequence matcher similarity
-        seq_sim = SequenceMatcher(None, norm1, norm2).ratio()
+        # Sequence similarity; rapidfuzz computes the same kind of ratio in C++
+        if RAPIDFUZZ_AVAILABLE:
+            seq_sim = fuzz.ratio(norm1, norm2) / 100.0
+        else:
+            seq_sim = SequenceMatcher(None, norm1, norm2).ratio()
         
         # Check if one name contains the other
         parts1 = set(norm1.split())
@@ -112,33 +249,24 @@ class TextCleaner:
         if not text:
             return ""
         
-        # Normalize unicode
-        text = unicodedata.normalize('NFD', text)
-        text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
-        
-        # Fix common OCR errors
-        replacements = {
-            'rn': 'm',
-            'cl': 'd',
-            '0': 'O',  # Only in specific contexts
-            '1': 'I',  # Only in specific contexts
-            'vv': 'w',
-            'ii': 'n',
-        }
+        # Normalize unicode (plain ASCII has no accents to strip)
+        if not text.isascii():
+            text = unicodedata.normalize('NFD', text)
+            text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
         
-        for old, new in replacements.items():
-            text = text.replace(old, new)
+        # Fix common OCR errors. Digits are left alone: swapping 0/1 for O/I
+        # across the whole text broke student numbers, course codes and GPAs
+        text = _OCR_FIX_RE.sub(lambda match: _OCR_FIXES[match.group()], text)
         
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         return text.strip()
     
     @staticmethod
     def extract_course_code(text: str) -> Optional[str]:
         """Extract and normalize course code"""
-        # Pattern for course codes: 2-4 letters followed by 3-4 digits
-        pattern = r'\b([A-Z]{2,4})\s*(\d{3,4}[A-Z]?)\b'
-        match = re.search(pattern, text.upper())
+        # Course codes: 2-4 letters followed by 3-4 digits
+        match = _COURSE_CODE_PARTS_RE.search(text.upper())
         
         if match:
             return f"{match.group(1)}{match.group(2)}"
@@ -229,36 +357,8 @@ class TranscriptDataExtractor:
         # First, log the beginning of the text to see what we're working with
         logger.info(f"Text preview for name extraction: {text[:500]}")
         
-        patterns = [
-            # Specific patterns based on the user's transcript format
-            r'Name:\s*([A-Z][A-Z\s]{10,50})\s*Stage',  # "Name: EASTON MICHURA OCHIENG Stage"
-            r'Name:\s*([A-Z][A-Z\s]{10,50})',
-            
-            # Names from fee statement format: "Name: EASTON MICHURA OCHIENG Stage: Y4S2"
-            r'Name:\s*([A-Z\s]{10,50})\s*Stage:',
-            
-            # All caps names with stage info
-            r'([A-Z]{2,}\s+[A-Z]{2,}\s+[A-Z]{2,})\s+Stage',
-            
-            # All caps names before student number or program info
-            r'([A-Z]{2,}\s+[A-Z]{2,}\s+[A-Z]{2,})\s*(?:\d{6,8}|Student|Programme|Program)',
-            
-            # Standard patterns
-            r'(?:student\s+name|name\s+of\s+student|full\s+name)[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})',
-            r'(?:name)[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})',
-            
-            # Names before ID/registration numbers
-            r'([A-Z][A-Z\s]{10,40})\s*(?:ID|STUDENT|REG|ADMISSION|\d{6,8})',
-            
-            # Names in proper case
-            r'\b([A-Z][a-z]{2,}\s+[A-Z][a-z]{2,}(?:\s+[A-Z][a-z]{2,}){0,2})\b',
-            
-            # Names after titles
-            r'(?:MR|MS|MISS|DR|PROF)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in _NAME_PATTERNS:
+            matches = pattern.findall(text)
             for match in matches:
                 cleaned_name = self._clean_name(match)
                 if self._is_valid_name(cleaned_name):
@@ -266,8 +366,7 @@ class TranscriptDataExtractor:
                     return cleaned_name
         
         # Fallback: Look for any sequence of 2-4 capitalized words
-        fallback_pattern = r'\b([A-Z][a-z]{2,}\s+[A-Z][a-z]{2,}(?:\s+[A-Z][a-z]{2,}){0,2})\b'
-        matches = re.findall(fallback_pattern, text)
+        matches = _FALLBACK_NAME_RE.findall(text)
         for match in matches:
             # Skip common header words
             if not any(skip_word in match.upper() for skip_word in [
@@ -284,18 +383,8 @@ class TranscriptDataExtractor:
     
     def _extract_student_id(self, text: str) -> str:
         """Extract student ID"""
-        patterns = [
-            # Specific patterns for this transcript format
-            r'(?:Student\s+No|Admission\s+Number):\s*(\d{6,8})',
-            r'#(\d{6,8})\s+Page',  # Found in transcript: #1046098 Page 1 of 3
-            r'(?:student\s+id|id\s+number|registration)[:\s]+([A-Z0-9]{6,15})',
-            r'(?:id)[:\s]+([A-Z0-9]{6,15})',
-            r'\b([A-Z]{2,3}\d{6,10})\b',  # Common ID format
-            r'\b(\d{6,8})\b'  # Numeric ID - specific length
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _STUDENT_ID_PATTERNS:
+            match = pattern.search(text)
             if match:
                 student_id = match.group(1).upper()
                 logger.info(f"Extracted student ID: {student_id}")
@@ -305,19 +394,8 @@ class TranscriptDataExtractor:
     
     def _extract_program(self, text: str) -> str:
         """Extract academic program"""
-        patterns = [
-            # Specific to transcript format: Programme: Bachelor of Science in Computer Science
-            r'Programme:\s*([^\n\r]{10,80})',
-            r'Program:\s*([^\n\r]{10,80})',
-            r'(?:course|program|degree|study)[:\s]+([^\n\r]{10,80})',
-            r'(?:bachelor|master|diploma|certificate)\s+(?:of\s+)?([^\n\r]{5,50})',
-            r'(?:bsc|ba|msc|ma|phd|btech|bcom)\s+([^\n\r]{5,50})',
-            r'(Bachelor\s+of\s+Science\s+in\s+Computer\s+Science)',  # Exact match for this case
-            r'(computer\s+science|information\s+technology|engineering|business|medicine|law|education)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _PROGRAM_PATTERNS:
+            match = pattern.search(text)
             if match:
                 program = self._clean_program_name(match.group(1))
                 logger.info(f"Extracted program: {program}")
@@ -330,31 +408,15 @@ class TranscriptDataExtractor:
         year = 0
         semester = 2  # Default
         
-        # Year patterns - specific to transcript format: Stage: Y4S2
-        year_patterns = [
-            r'Stage:\s*Y(\d+)S\d+',  # Stage: Y4S2 format
-            r'year[:\s]*(\d+)',
-            r'(?:level|class)[:\s]*(\d+)',
-            r'(\d+)(?:st|nd|rd|th)\s+year'
-        ]
-        
-        for pattern in year_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _YEAR_PATTERNS:
+            match = pattern.search(text)
             if match:
                 year_num = int(match.group(1))
                 if 1 <= year_num <= 6:
                     year = max(year, year_num)
         
-        # Semester patterns - specific to transcript format: Stage: Y4S2
-        sem_patterns = [
-            r'Stage:\s*Y\d+S(\d+)',  # Stage: Y4S2 format
-            r'semester[:\s]*(\d+)',
-            r'sem[:\s]*(\d+)',
-            r'term[:\s]*(\d+)'
-        ]
-        
-        for pattern in sem_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _SEMESTER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 sem_num = int(match.group(1))
                 if 1 <= sem_num <= 2:
@@ -362,7 +424,7 @@ class TranscriptDataExtractor:
         
         # Extract from course history - look for the most recent semester
         # Find the latest semester from course entries like "JAN-APR25"
-        semester_entries = re.findall(r'(JAN-APR|SEPT-DEC|MAY-AUG)(\d{2})', text)
+        semester_entries = _SEMESTER_ENTRY_RE.findall(text)
         if semester_entries:
             # Sort by year and get the latest
             sorted_entries = sorted(semester_entries, key=lambda x: int(x[1]), reverse=True)
@@ -384,35 +446,9 @@ class TranscriptDataExtractor:
         units = []
         lines = text.split('\n')
         
-        # Simple course code counting for this specific transcript format
-        # Look for course codes in the format: ABC 123 or ABC123
-        course_code_pattern = r'\b([A-Z]{2,4}\s*\d{3,4}[A-Z]?)\b'
-        
         # Track unique course codes found
         found_courses = set()
         
-        # Enhanced unit patterns specific to this transcript format
-        patterns = [
-            # Transcript format: CMT 108 INTRO. TO WEB DEVELOPMENT 24 50 74 A 3
-            # Code Title Cat Exam Mark Total Score Grade Credit
-            r'([A-Z]{2,4}\s+\d{3,4})\s+([A-Z][A-Z\s\.\&]{8,60})\s+\d+\s+\d+\s+\d+\s+([A-F][+-]?|[DIXZ])\s+(\d+)',
-            
-            # Alternative format with different spacing
-            r'([A-Z]{2,4}\s+\d{3,4})\s+([A-Z][A-Z\s\.\&/]{5,50})\s+(?:\d+\s+){2,3}([A-F][+-]?|[DIXZ])\s+(\d+)',
-            
-            # Standard format: CIT 3105 – Machine Learning – A
-            r'([A-Z]{2,4}\s*\d{3,4}[A-Z]?)\s*[–-]\s*([^–-]+)\s*[–-]\s*([A-F][+-]?|[IXZ]|PASS|FAIL)',
-            
-            # Tabular format: CIT3105 | Machine Learning | 3 | A
-            r'([A-Z]{2,4}\d{3,4})\s*\|\s*([^|]+)\s*\|\s*(\d+)\s*\|\s*([A-F][+-]?|[IXZ])',
-            
-            # Simple format: CIT3105 Machine Learning A
-            r'([A-Z]{2,4}\s*\d{3,4})\s+([A-Za-z\s]{10,50})\s+([A-F][+-]?|[IXZ])',
-            
-            # With units: CIT 3105 Machine Learning (3) A
-            r'([A-Z]{2,4}\s*\d{3,4})\s+([^()]+)\s*\((\d+)\)\s*([A-F][+-]?|[IXZ])'
-        ]
-        
         for line in lines:
             line = line.strip()
             if len(line) < 5:
@@ -426,8 +462,8 @@ class TranscriptDataExtractor:
                 continue
             
             # First, try specific patterns for detailed extraction
-            for pattern in patterns:
-                matches = re.findall(pattern, line, re.IGNORECASE)
+            for pattern in _UNIT_PATTERNS:
+                matches = pattern.findall(line)
                 for match in matches:
                     try:
                         unit = self._parse_unit_match(match, pattern)
@@ -439,8 +475,8 @@ class TranscriptDataExtractor:
                         logger.warning(f"Failed to parse unit from line: {line}, error: {e}")
             
             # Fallback: Count course codes even if we can't parse full details
-            if not any(pattern for pattern in patterns if re.search(pattern, line, re.IGNORECASE)):
-                course_matches = re.findall(course_code_pattern, line)
+            if not any(pattern.search(line) for pattern in _UNIT_PATTERNS):
+                course_matches = _COURSE_CODE_RE.findall(line)
                 for course_code in course_matches:
                     normalized_code = course_code.replace(' ', '').upper()
                     if normalized_code not in found_courses and len(normalized_code) >= 5:
@@ -460,15 +496,9 @@ class TranscriptDataExtractor:
         if len(units) == 0:
             logger.warning("No courses found with standard patterns, trying simple detection")
             
-            # Look for any pattern that might be course-related
-            simple_course_patterns = [
-                r'\b[A-Z]{2,4}\d{3,4}\b',  # Simple format: ABC123
-                r'\b[A-Z]{3,4}\s+\d{3,4}\b',  # Spaced format: ABC 123
-            ]
-            
             all_text = ' '.join(lines)
-            for pattern in simple_course_patterns:
-                matches = re.findall(pattern, all_text)
+            for pattern in _SIMPLE_COURSE_PATTERNS:
+                matches = pattern.findall(all_text)
                 for match in matches:
                     normalized_code = match.replace(' ', '').upper()
                     if normalized_code not in found_courses:
@@ -524,13 +554,8 @@ class TranscriptDataExtractor:
     
     def _extract_gpa(self, text: str) -> Optional[float]:
         """Extract GPA from text"""
-        patterns = [
-            r'(?:gpa|cgpa)[:\s]*(\d+\.?\d*)',
-            r'grade\s+point\s+average[:\s]*(\d+\.?\d*)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _GPA_PATTERNS:
+            match = pattern.search(text)
             if match:
                 try:
                     gpa = float(match.group(1))
@@ -548,8 +573,8 @@ class TranscriptDataExtractor:
             return ""
         
         # Remove extra whitespace and special characters
-        name = re.sub(r'[^\w\s]', '', name)
-        name = re.sub(r'\s+', ' ', name)
+        name = _NON_WORD_RE.sub('', name)
+        name = _WHITESPACE_RE.sub(' ', name)
         
         # Title case
         words = name.strip().split()
@@ -563,14 +588,14 @@ class TranscriptDataExtractor:
     
     def _clean_program_name(self, program: str) -> str:
         """Clean program name"""
-        program = re.sub(r'[^a-zA-Z0-9\s]', ' ', program)
-        program = re.sub(r'\s+', ' ', program)
+        program = _NON_ALNUM_RE.sub(' ', program)
+        program = _WHITESPACE_RE.sub(' ', program)
         return program.strip().title()
     
     def _clean_title(self, title: str) -> str:
         """Clean course title"""
-        title = re.sub(r'[^a-zA-Z0-9\s]', ' ', title)
-        title = re.sub(r'\s+', ' ', title)
+        title = _NON_ALNUM_RE.sub(' ', title)
+        title = _WHITESPACE_RE.sub(' ', title)
         return title.strip().title()
     
     def _is_valid_name(self, name: str) -> bool:
@@ -614,7 +639,7 @@ class TranscriptDataExtractor:
             'A', 'B', 'C', 'D', 'E', 'F', 'I', 'X', 'Z', 'P', 'PASS', 'FAIL',
             'F*', 'AU', 'EX', 'N/A'  # Additional transcript grades
         ]
-        return grade in valid_grades or re.match(r'^[A-F][+-]?$', grade)
+        return grade in valid_grades or _LETTER_GRADE_RE.match(grade)
     
     def _determine_unit_status(self, grade: str) -> str:
         """Determine unit status from grade"""
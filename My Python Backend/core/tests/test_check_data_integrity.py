@@ -0,0 +1,23 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.management.commands.check_data_integrity import ISSUES_CACHE_KEY
+from core.models import User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class IssuesCacheInvalidationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='jdoe', email='jdoe@example.com', password='x', role='admin',
+        )
+        cache.set(ISSUES_CACHE_KEY, {'signature': (), 'issues': {}})
+
+    def test_user_edit_drops_cached_issues(self):
+        self.user.email = 'john.doe@example.com'
+        self.user.save(update_fields=['email'])
+        self.assertIsNone(cache.get(ISSUES_CACHE_KEY))
+
+    def test_profile_delete_drops_cached_issues(self):
+        self.user.profile.delete()
+        self.assertIsNone(cache.get(ISSUES_CACHE_KEY))
@@ -0,0 +1,33 @@
+import datetime
+import decimal
+import uuid
+
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    data = {
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'final_grade': decimal.Decimal('72.50'),
+        'submitted_at': datetime.datetime(2025, 7, 27, 10, 57, 3, 123456, tzinfo=datetime.timezone.utc),
+        'week_start': datetime.date(2025, 7, 21),
+        'notes': 'Line\u2028separator',
+        'items': [1, 2.5, None, True],
+    }
+
+    def assertMatchesJSONRenderer(self, data, accepted_media_type=None, renderer_context=None):
+        expected = JSONRenderer().render(data, accepted_media_type, renderer_context)
+        actual = ORJSONRenderer().render(data, accepted_media_type, renderer_context)
+        self.assertEqual(actual, expected)
+
+    def test_compact_output_matches_json_renderer(self):
+        self.assertMatchesJSONRenderer(self.data, 'application/json')
+
+    def test_indented_output_matches_json_renderer(self):
+        self.assertMatchesJSONRenderer(self.data, 'application/json; indent=4')
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
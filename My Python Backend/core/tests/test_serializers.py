@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from core.serializers import CachedFieldsSerializerMixin
+
+
+class ChildSerializer(CachedFieldsSerializerMixin, serializers.Serializer):
+    name = serializers.CharField()
+    has_request = serializers.SerializerMethodField()
+
+    def get_has_request(self, obj):
+        return 'request' in self.context
+
+
+class ParentSerializer(CachedFieldsSerializerMixin, serializers.Serializer):
+    name = serializers.CharField()
+    children = ChildSerializer(many=True)
+
+
+class CachedFieldsSerializerMixinTests(SimpleTestCase):
+    def setUp(self):
+        self.request = APIRequestFactory().get('/')
+        self.parent = SimpleNamespace(
+            name='parent',
+            children=[SimpleNamespace(name='a'), SimpleNamespace(name='b')],
+        )
+
+    def test_nested_many_children_see_the_request(self):
+        # The first instance builds the cached fields; later ones reuse them
+        for _ in range(2):
+            data = ParentSerializer(self.parent, context={'request': self.request}).data
+            self.assertEqual(
+                data['children'],
+                [{'name': 'a', 'has_request': True}, {'name': 'b', 'has_request': True}],
+            )
+
+    def test_instances_do_not_share_nested_children(self):
+        first = ParentSerializer(self.parent, context={'request': self.request})
+        second = ParentSerializer(self.parent, context={})
+        
+        self.assertIsNot(first.fields['children'].child, second.fields['children'].child)
+        self.assertIs(first.fields['children'].child.root, first)
+        self.assertEqual(second.data['children'][0]['has_request'], False)
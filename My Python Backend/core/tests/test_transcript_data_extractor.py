@@ -0,0 +1,33 @@
+from django.test import SimpleTestCase
+
+from core.services.transcript_data_extractor import TextCleaner, TranscriptDataExtractor
+
+
+TRANSCRIPT_TEXT = """THE CATHOLIC UNIVERSITY OF EASTERN AFRICA
+ACADEMIC TRANSCRIPT #1046098 Page 1 of 3
+Name: EASTON MICHURA OCHIENG Stage: Y4S2
+Student No: 1046098
+Programme: Bachelor of Science in Computer Science
+CMT 108 INTRO. TO WEB DEVELOPMENT 24 50 74 A 3
+CMT 201 DATA STRUCTURES 20 45 65 B 3
+GPA: 3.10
+"""
+
+
+class TextCleanerTests(SimpleTestCase):
+    def test_fixes_ocr_letter_confusions(self):
+        self.assertEqual(TextCleaner.clean_text('cornputer  vveb'), 'computer web')
+
+    def test_leaves_digits_alone(self):
+        # 0 and 1 used to be swapped for O and I across the whole text
+        self.assertEqual(TextCleaner.clean_text('CMT 108 GPA 3.10 #1046098'), 'CMT 108 GPA 3.10 #1046098')
+
+
+class TranscriptDataExtractorTests(SimpleTestCase):
+    def test_extracts_numeric_fields(self):
+        data = TranscriptDataExtractor().extract_structured_data(TRANSCRIPT_TEXT)
+        
+        # With the digit swaps these came out as '', no units and a GPA of 3.0
+        self.assertEqual(data.student_id, '1046098')
+        self.assertEqual([unit.code.replace(' ', '') for unit in data.units], ['CMT108', 'CMT201'])
+        self.assertEqual(data.gpa, 3.1)
@@ -1,7 +1,7 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db.models import Q, Exists, OuterRef
 from ..models import (
     User, Profile, Student, Supervisor, Company, Attachment, SupervisorAssignment,
     VerificationStatus, WeeklyLog, Evaluation, Reimbursement, Message
@@ -41,8 +41,12 @@ class UserViewSet(viewsets.ModelViewSet):
         if request.user.role not in ['admin', 'dean']:
             return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
         
-        # Get all users
-        all_users = User.objects.all()
+        # Get all users, with related-record presence resolved in the same query
+        all_users = User.objects.annotate(
+            has_profile=Exists(Profile.objects.filter(user=OuterRef('pk'))),
+            has_student=Exists(Student.objects.filter(user=OuterRef('pk'))),
+            has_supervisor=Exists(Supervisor.objects.filter(user=OuterRef('pk'))),
+        )
         
         # Initialize issue tracking
         orphaned_users = []
@@ -53,9 +57,7 @@ class UserViewSet(viewsets.ModelViewSet):
             issues = []
             
             # Check for missing Profile
-            try:
-                profile = user.profile
-            except Profile.DoesNotExist:
+            if not user.has_profile:
                 issues.append('missing_profile')
                 missing_profiles.append({
                     'user_id': str(user.id),
@@ -67,9 +69,7 @@ class UserViewSet(viewsets.ModelViewSet):
             
             # Check for missing role-specific records
             if user.role == 'student':
-                try:
-                    student = user.student_profile
-                except Student.DoesNotExist:
+                if not user.has_student:
                     issues.append('missing_student_record')
                     missing_role_records.append({
                         'user_id': str(user.id),
@@ -80,9 +80,7 @@ class UserViewSet(viewsets.ModelViewSet):
                         'missing_record': 'Student'
                     })
             elif user.role == 'supervisor':
-                try:
-                    supervisor = user.supervisor_profile
-                except Supervisor.DoesNotExist:
+                if not user.has_supervisor:
                     issues.append('missing_supervisor_record')
                     missing_role_records.append({
                         'user_id': str(user.id),
@@ -139,12 +137,7 @@ class UserViewSet(viewsets.ModelViewSet):
         errors = []
         
         # Get all users without profiles
-        users_without_profiles = []
-        for user in User.objects.all():
-            try:
-                profile = user.profile
-            except Profile.DoesNotExist:
-                users_without_profiles.append(user)
+        users_without_profiles = User.objects.filter(profile__isnull=True)
         
         # Create missing profiles
         for user in users_without_profiles:
@@ -180,7 +173,7 @@ class StudentViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Student.objects.all()
+        queryset = StudentSerializer.setup_eager_loading(Student.objects.all())
         if self.request.user.role == 'student':
             # Students can only see their own data
             queryset = queryset.filter(user=self.request.user)
@@ -199,7 +192,7 @@ class SupervisorViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = Supervisor.objects.all()
+        queryset = SupervisorSerializer.setup_eager_loading(Supervisor.objects.all())
         if self.request.user.role == 'supervisor':
             # Supervisors can only see their own data
             queryset = queryset.filter(user=self.request.user)
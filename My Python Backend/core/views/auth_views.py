@@ -34,7 +34,7 @@ class RegisterView(generics.CreateAPIView):
                 # Create user
                 user = serializer.save()
                 
-                # Get or update profile (User.save() auto-creates one)
+                # Get or update profile (a database trigger auto-creates one)
                 profile, created = Profile.objects.get_or_create(
                     user=user,
                     defaults={
@@ -681,7 +681,7 @@ def get_verification_status(request):
                     'fee_verification_date': verification_status.fee_verification_date,
                     'both_verified': verification_status.is_verified and verification_status.fee_verified,
                     'notes': verification_status.verification_details.get('notes', '') if verification_status.verification_details else '',
-                    'student_name': f"{student.user.first_name} {student.user.last_name}",
+                    'student_name': student.full_name,
                     'program': student.program,
                     'year': student.year_of_study,
                     'semester': student.semester
@@ -697,7 +697,7 @@ def get_verification_status(request):
                     'fee_verification_date': None,
                     'both_verified': False,
                     'notes': 'No verification attempted yet',
-                    'student_name': f"{student.user.first_name} {student.user.last_name}",
+                    'student_name': student.full_name,
                     'program': student.program,
                     'year': student.year_of_study,
                     'semester': student.semester
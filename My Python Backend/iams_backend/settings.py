@@ -81,6 +81,16 @@ DATABASES = {
 #     }
 # }
 
+# Cache
+# File-based by default so results persist across management command runs;
+# point CACHE_BACKEND/CACHE_LOCATION at Redis or Memcached in production.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / '.django_cache')),
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -120,6 +130,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20
 }
@@ -162,4 +176,9 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='IAMS System <noreply@iams.edu>')
 
 # Frontend URL for password reset links
-FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:5173')
\ No newline at end of file
+FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:5173')
+
+# Load the DocTR OCR model when the WSGI app starts instead of on the first
+# OCR request; with a pre-forking server (e.g. gunicorn --preload) the
+# workers then share the weights
+PRELOAD_OCR_MODELS = config('PRELOAD_OCR_MODELS', default=False, cast=bool)
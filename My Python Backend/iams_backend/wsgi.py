@@ -8,4 +8,10 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iams_backend.settings')
 
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+from django.conf import settings
+
+if settings.PRELOAD_OCR_MODELS:
+    from core.services.comprehensive_enhanced_ocr import get_doctr_model
+    get_doctr_model()